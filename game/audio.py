@@ -0,0 +1,107 @@
+"""
+Low-latency audio manager with reserved channel pools
+"""
+
+import os
+import pygame
+from .constants import (
+    AUDIO_FREQUENCY, AUDIO_SAMPLE_SIZE, AUDIO_OUTPUT_CHANNELS, AUDIO_BUFFER_SIZE,
+    AUDIO_CHANNELS_PER_SOUND, AUDIO_MIN_INTERVAL_MS
+)
+
+
+class SoundPool:
+    """A sound effect with its own reserved mixer channels"""
+
+    def __init__(self, sound, channel_ids, min_interval_ms=AUDIO_MIN_INTERVAL_MS):
+        self.sound = sound
+        self.channels = [pygame.mixer.Channel(i) for i in channel_ids]
+        self.min_interval_ms = min_interval_ms
+        self.last_play_ms = None
+        self.next_index = 0  # Round-robin position used when every channel is busy
+
+    def pick_channel(self):
+        """Get index of a free channel, or steal the oldest one"""
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i
+
+        index = self.next_index
+        self.next_index = (self.next_index + 1) % len(self.channels)
+        self.channels[index].stop()
+        return index
+
+
+class AudioManager:
+    """Plays sound effects from pre-loaded sounds on reserved channels"""
+
+    def __init__(self):
+        self.enabled = pygame.mixer.get_init() is not None
+        self.pools = {}
+        self.next_channel = 0
+        self.dropped = 0  # Plays skipped by rate limiting
+
+    @staticmethod
+    def pre_init():
+        """Configure mixer for low latency (must be called before pygame.init)"""
+        pygame.mixer.pre_init(
+            AUDIO_FREQUENCY, AUDIO_SAMPLE_SIZE, AUDIO_OUTPUT_CHANNELS, AUDIO_BUFFER_SIZE
+        )
+
+    def load(self, name, path, channels=AUDIO_CHANNELS_PER_SOUND):
+        """Load a sound and reserve a pool of channels for it"""
+        if not self.enabled or not os.path.exists(path):
+            return False
+
+        try:
+            # Sounds are decoded to the mixer's sample format once, here
+            sound = pygame.mixer.Sound(path)
+        except pygame.error:
+            print(f"Warning: Could not load sound {path}")
+            return False
+
+        channel_ids = range(self.next_channel, self.next_channel + channels)
+        self.next_channel += channels
+        # Reserved channels are never picked by Sound.play() or other pools
+        if pygame.mixer.get_num_channels() < self.next_channel:
+            pygame.mixer.set_num_channels(self.next_channel)
+        pygame.mixer.set_reserved(self.next_channel)
+
+        self.pools[name] = SoundPool(sound, channel_ids)
+        return True
+
+    def play_music(self, path):
+        """Load and loop background music"""
+        if not self.enabled or not os.path.exists(path):
+            return
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.play(-1)  # -1 means loop infinitely
+        except pygame.error:
+            print(f"Warning: Could not load background music {path}")
+
+    def play(self, name):
+        """Play a sound effect, returns False if unavailable or rate limited"""
+        pool = self.pools.get(name)
+        if pool is None:
+            return False
+
+        now = pygame.time.get_ticks()
+        if pool.last_play_ms is not None and now - pool.last_play_ms < pool.min_interval_ms:
+            self.dropped += 1
+            return False
+        pool.last_play_ms = now
+
+        pool.channels[pool.pick_channel()].play(pool.sound)
+        return True
+
+    def get_latency_stats(self):
+        """Get the audio latency the mixer is configured for, in milliseconds
+
+        SDL_mixer cannot tell when a sound is actually heard, so this is not a
+        measurement: buffer_ms is the delay one mixer buffer adds by configuration,
+        the least a sound can lag behind play(). Device latency comes on top.
+        """
+        init = pygame.mixer.get_init()
+        buffer_ms = AUDIO_BUFFER_SIZE * 1000.0 / init[0] if init else None
+        return {'buffer_ms': buffer_ms, 'dropped': self.dropped}
@@ -20,7 +20,9 @@ class Bird(pygame.sprite.Sprite):
         if image_path and os.path.exists(image_path):
             try:
                 # Load and scale the image
-                self.image = pygame.image.load(image_path).convert_alpha()
+                self.image = pygame.image.load(image_path)
+                if pygame.display.get_surface():  # No display surface with the texture renderer
+                    self.image = self.image.convert_alpha()
                 self.image = pygame.transform.scale(self.image, (BIRD_WIDTH, BIRD_HEIGHT))
             except pygame.error:
                 # If image loading fails, use default drawing
@@ -32,6 +34,7 @@ class Bird(pygame.sprite.Sprite):
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
+        self.previous_rect = self.rect.copy()  # Position before the last update (for swept collisions)
         
         # Initialize bird properties
         self.velocity = 0
@@ -62,6 +65,8 @@ class Bird(pygame.sprite.Sprite):
     
     def update(self):
         """Update bird position based on physics"""
+        self.previous_rect = self.rect.copy()
+        
         # Update invincibility timer
         if self.invincible:
             self.invincible_timer -= 1
@@ -105,6 +110,7 @@ class Bird(pygame.sprite.Sprite):
         """Reset bird to initial state"""
         self.rect.x = BIRD_START_X
         self.rect.y = BIRD_START_Y
+        self.previous_rect = self.rect.copy()
         self.velocity = 0
         self.lives = INITIAL_LIVES
         self.alive = True
@@ -4,11 +4,16 @@ Coin collection system
 
 import pygame
 from .constants import COIN_SIZE, GOLD, YELLOW, COIN_ROTATION_SPEED, PIPE_SPEED
+from .collision import sweep_from
 
 
 class Coin(pygame.sprite.Sprite):
     """Collectible coin sprite"""
     
+    # Rotated coin images and their sizes by angle, shared by all coins since they look the same
+    rotated_images = {}
+    rotated_sizes = {}
+    
     def __init__(self, x, y):
         super().__init__()
         self.image = pygame.Surface((COIN_SIZE, COIN_SIZE), pygame.SRCALPHA)
@@ -24,22 +29,59 @@ class Coin(pygame.sprite.Sprite):
         self.rotation_angle = 0
         self.collected = False
     
-    def update(self):
-        """Update coin animation and position"""
+    def update(self, rotation_step=COIN_ROTATION_SPEED, frames=1):
+        """Update coin animation and position
+        
+        rotation_step is the angle between distinct rotation frames, 0 for a static coin.
+        """
         if not self.collected:
             # Move coin left with pipes
-            self.rect.x -= PIPE_SPEED
+            self.rect.x -= PIPE_SPEED * frames
             
             # Rotate coin
-            self.rotation_angle += COIN_ROTATION_SPEED
-            if self.rotation_angle >= 360:
-                self.rotation_angle = 0
-            
-            # Create rotated image
-            self.image = pygame.transform.rotate(self.base_image, self.rotation_angle)
-            # Update rect center to maintain position after rotation
-            old_center = self.rect.center
-            self.rect = self.image.get_rect(center=old_center)
+            self.set_angle((self.rotation_angle + COIN_ROTATION_SPEED * frames) % 360,
+                           rotation_step, self.rect.center)
+    
+    def set_angle(self, angle, rotation_step, center):
+        """Rotate the coin to angle, keeping it centered on center
+        
+        The rect (the coin's hitbox) always follows the real angle; only the image
+        drawn is snapped to rotation_step, so quality never changes what is collected.
+        """
+        self.rotation_angle = angle
+        self.image = self.get_rotated_image(self.shown_angle(angle, rotation_step))
+        self.rect = pygame.Rect((0, 0), self.get_rotated_size(angle))
+        self.rect.center = center
+    
+    @staticmethod
+    def shown_angle(angle, rotation_step):
+        """Snap an angle to the rotation frames allowed by the current quality"""
+        if rotation_step:
+            return angle - angle % rotation_step
+        return 0
+    
+    def rect_ahead(self, frames):
+        """Get the rect this coin will have after frames more rotations, without moving"""
+        angle = (self.rotation_angle + COIN_ROTATION_SPEED * frames) % 360
+        rect = pygame.Rect((0, 0), self.get_rotated_size(angle))
+        rect.center = self.rect.center
+        return rect
+    
+    def get_rotated_size(self, angle):
+        """Get size of the coin rotated by angle, without keeping the rotated image"""
+        size = Coin.rotated_sizes.get(angle)
+        if size is None:
+            image = Coin.rotated_images.get(angle) or pygame.transform.rotate(self.base_image, angle)
+            size = Coin.rotated_sizes[angle] = image.get_size()
+        return size
+    
+    def get_rotated_image(self, angle):
+        """Get coin image rotated by angle, rotating it only the first time"""
+        image = Coin.rotated_images.get(angle)
+        if image is None:
+            image = pygame.transform.rotate(self.base_image, angle)
+            Coin.rotated_images[angle] = image
+        return image
     
     def collect(self):
         """Mark coin as collected"""
@@ -57,6 +99,7 @@ class CoinManager:
     def __init__(self):
         self.coins = pygame.sprite.Group()
         self.collected_count = 0
+        self.rotation_step = COIN_ROTATION_SPEED
     
     def spawn_coin(self, x, y):
         """Spawn a coin at the specified position"""
@@ -64,15 +107,28 @@ class CoinManager:
         self.coins.add(coin)
         return coin
     
-    def update(self):
+    def set_rotation_step(self, rotation_step):
+        """Set angle between coin rotation frames (0 for static coins)"""
+        self.rotation_step = rotation_step
+    
+    def update(self, frames=1):
         """Update all coins"""
-        self.coins.update()
+        self.coins.update(self.rotation_step, frames)
     
-    def check_collision(self, bird_rect):
-        """Check if bird collides with any coin"""
+    def check_collision(self, bird_rect, previous_rect=None, frames_ahead=0):
+        """Check if bird collides with any coin
+        
+        With previous_rect the bird's path from previous_rect to bird_rect is swept.
+        frames_ahead is how many updates the coins are behind (see Game.advance).
+        """
         # Check collision with bird rect
         for coin in list(self.coins):  # Use list to avoid modification during iteration
-            if bird_rect.colliderect(coin.rect):
+            coin_rect = coin.rect_ahead(frames_ahead) if frames_ahead else coin.rect
+            if previous_rect is None:
+                hit = bird_rect.colliderect(coin_rect)
+            else:
+                hit = sweep_from(previous_rect, bird_rect, coin_rect) is not None
+            if hit:
                 coin.collect()
                 self.collected_count += 1
                 return True
@@ -94,6 +150,13 @@ class CoinManager:
         self.collected_count = 0
     
     def draw(self, screen):
-        """Draw all coins"""
-        self.coins.draw(screen)
+        """Draw all coins, returns the areas drawn"""
+        blit_rotated = getattr(screen, 'blit_rotated', None)
+        if blit_rotated:
+            # Texture canvases rotate the base image themselves
+            return [blit_rotated(coin.base_image, coin.rect.center,
+                                 Coin.shown_angle(coin.rotation_angle, self.rotation_step))
+                    for coin in self.coins]
+        return [screen.blit(coin.image, coin.image.get_rect(center=coin.rect.center))
+                for coin in self.coins]
 
@@ -0,0 +1,40 @@
+"""
+Swept (continuous) collision between moving rectangles
+"""
+
+import math
+
+
+def _axis_times(start, size, delta, other_start, other_size):
+    """Get the open time interval in which two moving spans overlap on one axis"""
+    if delta == 0:
+        # Not moving relative to each other: overlapping the whole time or never
+        if start < other_start + other_size and other_start < start + size:
+            return -math.inf, math.inf
+        return math.inf, -math.inf
+    enter = (other_start - (start + size)) / delta
+    leave = (other_start + other_size - start) / delta
+    return (enter, leave) if delta > 0 else (leave, enter)
+
+
+def sweep(rect, delta, other, other_delta=(0, 0)):
+    """Get the time of impact in [0, 1] of two rects moving by delta and other_delta
+
+    Rects count as colliding when they overlap, like Rect.colliderect (touching
+    edges do not). Returns None if they never overlap during the move, 0 if they
+    already overlap at the start.
+    """
+    dx = delta[0] - other_delta[0]
+    dy = delta[1] - other_delta[1]
+    enter_x, leave_x = _axis_times(rect.x, rect.width, dx, other.x, other.width)
+    enter_y, leave_y = _axis_times(rect.y, rect.height, dy, other.y, other.height)
+    enter = max(enter_x, enter_y, 0.0)
+    leave = min(leave_x, leave_y, 1.0)
+    if enter < leave:
+        return enter
+    return None
+
+
+def sweep_from(previous, current, other):
+    """Get the time of impact of a rect moving from previous to current against a static rect"""
+    return sweep(previous, (current.x - previous.x, current.y - previous.y), other)
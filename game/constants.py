@@ -7,6 +7,10 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
 
+# Renderer settings
+RENDERER_BACKEND = "surface"  # "surface" blits in software, "texture" draws with the SDL2 GPU renderer
+WINDOW_SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)  # Texture backend window size, the game is scaled to fit
+
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -35,7 +39,7 @@ BIRD_IMAGE_PATH = "assets/images/bird.png"  # Path to bird image (optional)
 PIPE_WIDTH = 80
 PIPE_GAP = 200
 PIPE_SPEED = 3
-PIPE_SPAWN_DISTANCE = 300
+PIPE_SPACING = 600  # Horizontal distance between consecutive pipe pairs
 PIPE_MIN_HEIGHT = 100
 PIPE_MAX_HEIGHT = 400
 PIPE_HORIZONTAL_PADDING = 20  # Horizontal extension at pipe openings (manhole effect)
@@ -51,6 +55,66 @@ INITIAL_LIVES = 3
 SCORE_INCREMENT = 1
 COIN_SCORE = 10
 
+# Input latency settings
+INPUT_LATENCY_HISTORY = 240  # Number of input-to-flip samples kept for reporting
+LATE_LATCH_INPUT = False  # Sample input just before the physics step instead of at frame start
+LATE_LATCH_MARGIN_MS = 2  # Safety margin left before the frame deadline
+LATE_LATCH_POLL_MS = 1  # Input polling interval while waiting for the latch point
+LATENCY_REPORT = True  # Print latency numbers when the game exits
+
+# Idle throttling for static screens (menu, game over)
+IDLE_THROTTLE = True  # Wait for input instead of redrawing unchanged screens at full FPS
+IDLE_TICK_MS = 500  # Longest wait before redrawing a static screen anyway
+
+# Quality governor settings
+QUALITY_GOVERNOR_ENABLED = True  # Lower visual quality when frames take too long
+QUALITY_WINDOW = 60  # Frames averaged before deciding to change quality
+QUALITY_DOWNGRADE_RATIO = 0.9  # Step down when average frame work exceeds 90% of the frame budget
+QUALITY_UPGRADE_RATIO = 0.5  # Step back up when it falls below 50% of the budget
+QUALITY_COOLDOWN = 120  # Frames to wait after a change before changing again
+
+# Pixel observation settings (for learning agents)
+OBSERVATION_DOWNSAMPLE = 4  # Keep every 4th pixel in each direction (800x600 -> 200x150)
+OBSERVATION_GRAYSCALE = True
+OBSERVATION_STACK = 4  # Number of recent frames kept in the frame stack
+
+# Neuroevolution trainer settings
+TRAIN_POPULATION = 256  # Genomes per generation
+TRAIN_HIDDEN_SIZE = 8  # Hidden units in each policy network
+TRAIN_COURSES = 4  # Seeded courses every genome is evaluated on
+TRAIN_MAX_FRAMES = 6000  # Frames per course before an episode is cut off (100s at 60 FPS)
+TRAIN_ELITE_COUNT = 4  # Best genomes copied unchanged into the next generation
+TRAIN_PARENT_FRACTION = 0.2  # Fraction of the population allowed to reproduce
+TRAIN_MUTATION_STD = 0.2  # Standard deviation of weight mutations
+TRAIN_CHECKPOINT_EVERY = 10  # Generations between checkpoints
+
+# State snapshot settings
+SNAPSHOT_HISTORY = 300  # Snapshots kept for rewind (5 seconds at 60 FPS)
+SNAPSHOT_MAX_PIPES = 16  # Pipe pairs (and coins) a snapshot record has room for, 3 or 4 are ever on screen
+
+# Game server settings
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_TICK_RATE = FPS  # Simulation ticks per second, shared by all sessions
+SERVER_MAX_SESSIONS = 1000
+SERVER_MAX_CATCHUP_TICKS = 4  # Ticks a late clock may run in one go before time is dropped
+SERVER_MAX_QUEUED_PRESSES = 8  # Presses waiting per session (one is applied per tick), extra ones are dropped
+SERVER_SEND_BUFFER_LIMIT = 64 * 1024  # Bytes queued for a client before it is disconnected as too slow
+SERVER_METRICS_HISTORY = 600  # Ticks kept for latency metrics (10 seconds at 60 ticks/s)
+SERVER_STATS_INTERVAL = 5  # Seconds between metrics reports
+
+# Soak test settings (long headless runs looking for leaks)
+SOAK_HOURS = 1.0  # Simulated play time per run
+SOAK_MAX_ROUND_FRAMES = 3600  # The scripted player stops flapping after at most this many frames
+SOAK_WARMUP_ROUNDS = 5  # Rounds ignored before measuring growth (caches filling up)
+SOAK_GROWTH_TOLERANCE = 0.1  # Flag a metric that grows more than 10% from the start to the end of a run
+SOAK_TOP_ALLOCATIONS = 10  # Source lines with the most memory growth shown in the report
+
+# Course generation settings
+COURSE_DIFFICULTY = "classic"  # Difficulty curve for gap size and pipe spacing (see course.DIFFICULTY_CURVES)
+COURSE_CHUNK_SIZE = 64  # Pipe pairs generated at once
+COURSE_LOOKAHEAD = 8  # Upcoming pipe pairs Game.get_upcoming_pipes returns by default
+
 # Font settings
 FONT_SIZE_LARGE = 48
 FONT_SIZE_MEDIUM = 32
@@ -61,3 +125,11 @@ COIN_SOUND_PATH = "assets/sounds/coin.wav"  # Path to coin collection sound
 COLLISION_SOUND_PATH = "assets/sounds/collision.wav"  # Path to collision sound
 BACKGROUND_MUSIC_PATH = "assets/sounds/background.wav"  # Path to background music
 
+# Audio mixer settings (small buffer = low latency)
+AUDIO_FREQUENCY = 44100
+AUDIO_SAMPLE_SIZE = -16  # Signed 16-bit samples
+AUDIO_OUTPUT_CHANNELS = 2  # Stereo
+AUDIO_BUFFER_SIZE = 512  # Samples per mixer buffer (~12ms at 44.1kHz)
+AUDIO_CHANNELS_PER_SOUND = 4  # Reserved mixer channels per sound effect
+AUDIO_MIN_INTERVAL_MS = 40  # Minimum time between two plays of the same sound
+
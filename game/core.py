@@ -0,0 +1,190 @@
+"""
+Game rules without a window or sound device
+
+GameCore holds the bird, pipes, coins, course and game states and steps them;
+Game adds the window, audio and frame pacing on top, and server sessions use
+it as is.
+"""
+
+import pygame
+import random
+from .constants import (
+    SCREEN_WIDTH, FPS, PIPE_SPEED, COIN_ROTATION_SPEED, COURSE_DIFFICULTY, COURSE_LOOKAHEAD
+)
+from .bird import Bird
+from .pipes import PipePair
+from .coins import CoinManager
+from .course import Course, SPAWN_EDGE, get_curve
+from .quality import QualityGovernor
+from .game_state import MenuState, PlayingState, GameOverState
+
+
+class GameCore:
+    """Game objects and rules, stepped without drawing"""
+    
+    def __init__(self, bird_image=None, audio=None, quality=None):
+        # Game objects
+        self.bird = Bird(image_path=bird_image)
+        self.pipes = []
+        self.coin_manager = CoinManager()
+        self.audio = audio  # Plays state sound effects when given
+        
+        # Visual quality, lowered when frames run long
+        self.quality = quality or QualityGovernor(FPS)
+        
+        # Game state
+        self.current_state = MenuState()
+        self.running = True
+        
+        # Pipe spawning from the round's course
+        self.course_seed = None  # Course seed for every round, a random one per round if None
+        self.difficulty = COURSE_DIFFICULTY  # Curve name or object, see course.DIFFICULTY_CURVES
+        self.course = None
+        self.next_pipe = 0  # Index of the next course pipe pair to spawn
+        self.round_frames = 0  # Frames played this round, the course scrolls PIPE_SPEED per frame
+    
+    def reset_game(self):
+        """Reset game to initial state"""
+        self.bird.reset()
+        self.pipes = []
+        self.coin_manager.reset()
+        self.next_pipe = 0
+        self.round_frames = 0
+        
+        # Start over on the same course when the seed and curve stay the same
+        seed = self.course_seed if self.course_seed is not None else random.getrandbits(32)
+        curve = get_curve(self.difficulty)
+        if self.course is None or self.course.seed != seed or self.course.curve is not curve:
+            self.course = Course(seed, curve)
+    
+    def get_upcoming_pipes(self, count=COURSE_LOOKAHEAD):
+        """Get positions, gap ys, gap sizes and coins of the next count pipe pairs to spawn
+        
+        Screen x of an upcoming pipe pair is its position minus
+        PIPE_SPEED * round_frames.
+        """
+        return self.course.upcoming(self.next_pipe, count)
+    
+    def spawn_pipes(self, frames_ahead=0):
+        """Spawn the course pipe pairs that scroll into view this frame"""
+        scrolled = PIPE_SPEED * self.round_frames
+        while self.course.get(self.next_pipe)[0] - scrolled <= SPAWN_EDGE:
+            self.spawn_pipe_pair(self.next_pipe, frames_ahead)
+            self.next_pipe += 1
+    
+    def spawn_pipe_pair(self, index, frames_ahead=0):
+        """Spawn pipe pair index of the course
+        
+        It is placed where it was before this frame's move. frames_ahead is how
+        many frames the world is behind (see advance); the new pipe and coin are
+        placed so they catch up with the others.
+        """
+        position, gap_y, gap, has_coin = self.course.get(index)
+        x = position - PIPE_SPEED * (self.round_frames - 1 - frames_ahead)
+        pipe_pair = PipePair(x, bands=self.quality.get_setting('pipe_bands'), gap_y=gap_y, gap=gap)
+        self.pipes.append(pipe_pair)
+        
+        # Coin in the gap where the course has one
+        if has_coin:
+            gap_center_y = pipe_pair.get_gap_center()
+            coin_x = pipe_pair.x + 40  # Center of pipe width
+            coin_y = gap_center_y
+            coin = self.coin_manager.spawn_coin(coin_x, coin_y)
+            coin.rotation_angle = (-COIN_ROTATION_SPEED * frames_ahead) % 360
+    
+    def update_pipes(self):
+        """Update all pipes and remove off-screen ones"""
+        for pipe_pair in self.pipes[:]:
+            pipe_pair.update()
+            if pipe_pair.is_off_screen():
+                self.pipes.remove(pipe_pair)
+    
+    def handle_state_transition(self):
+        """Handle state transitions"""
+        next_state = self.current_state.get_next_state()
+        if next_state:
+            self.current_state.reset_next_state()
+            
+            if next_state == 'playing':
+                self.reset_game()
+                self.current_state = PlayingState(
+                    self.bird, self.pipes, self.coin_manager, self.audio, self.quality
+                )
+            elif next_state == 'game_over':
+                playing_state = self.current_state
+                final_score = playing_state.get_score()
+                coins_collected = self.coin_manager.get_collected_count()
+                self.current_state = GameOverState(final_score, coins_collected)
+            elif next_state == 'menu':
+                self.reset_game()
+                self.current_state = MenuState()
+    
+    def handle_events(self, events):
+        """Dispatch (event, timestamp) pairs to the current state"""
+        for event, _ in events:
+            if event.type == pygame.QUIT:
+                self.running = False
+            
+            self.current_state.handle_event(event)
+    
+    def update_world(self):
+        """Spawn and move pipes and coins (nothing here depends on input)"""
+        if not isinstance(self.current_state, PlayingState):
+            return
+        
+        # Spawn pipes
+        self.round_frames += 1
+        self.spawn_pipes()
+        
+        self.update_pipes()
+        self.coin_manager.update()
+        self.coin_manager.remove_off_screen(SCREEN_WIDTH)
+    
+    def update_bird(self, frames_ahead=0):
+        """Step bird physics and score passed pipes"""
+        if not isinstance(self.current_state, PlayingState):
+            return
+        
+        self.bird.update()
+        
+        # Update score when passing pipes
+        for pipe_pair in self.pipes:
+            if pipe_pair.check_passed(self.bird.rect.x + PIPE_SPEED * frames_ahead):
+                self.current_state.score += 1
+    
+    def advance(self, frames, events=()):
+        """Advance play by up to frames frames at once, without drawing
+        
+        Only the bird is stepped every frame; collisions and scoring are checked
+        against where pipes and coins would be on that frame, and the world is moved
+        once at the end. The result is the same as calling Game.step() frames times with
+        the events given on the first. Stops early when the game ends and returns
+        the number of frames advanced.
+        """
+        self.handle_events(events)
+        self.handle_state_transition()
+        if not isinstance(self.current_state, PlayingState):
+            return 0
+        
+        done = 0
+        while done < frames:
+            done += 1
+            self.round_frames += 1
+            self.spawn_pipes(frames_ahead=done - 1)
+            self.update_bird(frames_ahead=done)
+            self.current_state.update(frames_ahead=done)
+            if self.current_state.get_next_state():
+                break
+        
+        # Catch the world up
+        for pipe_pair in self.pipes[:]:
+            pipe_pair.update(done)
+            if pipe_pair.is_off_screen():
+                self.pipes.remove(pipe_pair)
+        self.coin_manager.update(done)
+        self.coin_manager.remove_off_screen(SCREEN_WIDTH)
+        return done
+    
+    def apply_quality(self):
+        """Pass the current quality level on to objects that cache its settings"""
+        self.coin_manager.set_rotation_step(self.quality.get_setting('coin_rotation_step'))
@@ -0,0 +1,204 @@
+"""
+Seeded course generation with difficulty curves
+
+A course is the endless row of pipe pairs a round is played on: where each
+pair sits, where its gap is, how tall the gap is and whether it holds a coin.
+Pipes are generated in chunks from the course seed, so spawning code, art
+caches and bots can read as far ahead as they like. Whole courses can be
+precomputed into one file that worker processes load instead of generating
+(only this needs NumPy).
+
+Usage:
+    python -m game.course save courses.npz --courses 64 --pipes 512
+"""
+
+import argparse
+import bisect
+import random
+from .constants import (
+    SCREEN_WIDTH, PIPE_GAP, PIPE_SPACING, PIPE_MIN_HEIGHT, PIPE_MAX_HEIGHT, PIPE_HORIZONTAL_PADDING,
+    COIN_SPAWN_PROBABILITY, COURSE_DIFFICULTY, COURSE_CHUNK_SIZE, COURSE_LOOKAHEAD
+)
+
+COURSE_START = SCREEN_WIDTH + PIPE_SPACING  # Course position of the first pipe pair
+SPAWN_EDGE = SCREEN_WIDTH + PIPE_HORIZONTAL_PADDING  # Pipe pairs spawn once their image reaches the screen
+
+
+class DifficultyCurve:
+    """Gap size and pipe spacing that change linearly over a stretch of the course
+
+    Values go from their start to their end value between ramp_start and
+    ramp_start + ramp_length pixels into the course and stay there. Any object
+    with gap(position) and spacing(position) methods returning whole pixels for
+    a course position can be used as a curve.
+    """
+
+    def __init__(self, gap_start=PIPE_GAP, gap_end=PIPE_GAP, spacing_start=PIPE_SPACING,
+                 spacing_end=PIPE_SPACING, ramp_start=0, ramp_length=1):
+        self.gaps = (gap_start, gap_end)
+        self.spacings = (spacing_start, spacing_end)
+        self.ramp = (ramp_start, ramp_start + ramp_length)
+
+    def interpolate(self, position, values):
+        """Get the value of a (start, end) pair at a course position"""
+        start, end = self.ramp
+        progress = min(max((position - start) / (end - start), 0.0), 1.0)
+        return round(values[0] + (values[1] - values[0]) * progress)
+
+    def gap(self, position):
+        """Get gap size of a pipe pair at a course position"""
+        return self.interpolate(position, self.gaps)
+
+    def spacing(self, position):
+        """Get distance from a pipe pair at a course position to the next one"""
+        return self.interpolate(position, self.spacings)
+
+
+# Ramps last 36000 pixels, 200 seconds of play
+DIFFICULTY_CURVES = {
+    'classic': DifficultyCurve(),
+    'ramp': DifficultyCurve(PIPE_GAP + 40, PIPE_GAP - 40, PIPE_SPACING, PIPE_SPACING - 180,
+                            ramp_start=COURSE_START, ramp_length=36000),
+    'hard': DifficultyCurve(PIPE_GAP - 40, PIPE_GAP - 40, PIPE_SPACING - 180, PIPE_SPACING - 180),
+}
+
+
+def get_curve(curve):
+    """Get a difficulty curve from its name, curves are passed through"""
+    if isinstance(curve, str):
+        try:
+            return DIFFICULTY_CURVES[curve]
+        except KeyError:
+            raise ValueError(f"Unknown difficulty curve {curve!r}, "
+                             f"choose from {', '.join(DIFFICULTY_CURVES)}") from None
+    return curve
+
+
+class Course:
+    """Pipe pairs of one seeded course, generated a chunk at a time
+
+    Pipe pair i sits positions[i] pixels into the course (its screen x is that
+    minus the distance scrolled), with gap_ys[i] and gaps[i] the top and size of
+    its gap and coins[i] whether a coin floats in it. Chunk k is drawn from its own
+    random.Random seeded with "seed/k", so the same seed and curve always give
+    the same course no matter how far ahead it was read.
+    """
+
+    def __init__(self, seed, curve=COURSE_DIFFICULTY, chunk_size=COURSE_CHUNK_SIZE):
+        self.seed = seed
+        self.curve = get_curve(curve)
+        self.chunk_size = chunk_size
+        self.positions = []
+        self.gap_ys = []
+        self.gaps = []
+        self.coins = []
+
+    def __len__(self):
+        """Get number of pipe pairs generated so far"""
+        return len(self.positions)
+
+    def generate_chunk(self):
+        """Append the next chunk of pipe pairs"""
+        if self.positions:
+            position = self.positions[-1] + self.curve.spacing(self.positions[-1])
+        else:
+            position = COURSE_START
+
+        rng = random.Random(f"{self.seed}/{len(self.positions) // self.chunk_size}")
+        for _ in range(self.chunk_size):
+            gap = self.curve.gap(position)
+            self.positions.append(position)
+            self.gaps.append(gap)
+            # Taller gaps leave less room to move them, the lowest gap always ends at the same height
+            self.gap_ys.append(rng.randint(PIPE_MIN_HEIGHT, PIPE_MAX_HEIGHT + PIPE_GAP - gap))
+            self.coins.append(rng.random() < COIN_SPAWN_PROBABILITY)
+            position += self.curve.spacing(position)
+
+    def generate(self, count):
+        """Make sure at least count pipe pairs are generated"""
+        while len(self.positions) < count:
+            self.generate_chunk()
+
+    def generate_to(self, position):
+        """Generate past a course position, returns the number of pipe pairs up to it"""
+        while not self.positions or self.positions[-1] <= position:
+            self.generate_chunk()
+        return bisect.bisect_right(self.positions, position)
+
+    def get(self, index):
+        """Get (position, gap y, gap size, has coin) of pipe pair index"""
+        self.generate(index + 1)
+        return self.positions[index], self.gap_ys[index], self.gaps[index], self.coins[index]
+
+    def upcoming(self, index, count=COURSE_LOOKAHEAD):
+        """Get the lookahead buffer: positions, gap ys, gap sizes and coins of count pipe pairs from index"""
+        self.generate(index + count)
+        end = index + count
+        return self.positions[index:end], self.gap_ys[index:end], self.gaps[index:end], self.coins[index:end]
+
+
+def save_courses(path, seeds, pipes, curve=COURSE_DIFFICULTY, chunk_size=COURSE_CHUNK_SIZE):
+    """Precompute the first pipes pipe pairs of a course per seed into a .npz file
+
+    Everything fits in small integer arrays (9 bytes per pipe pair). The count is
+    rounded up to whole chunks so loaded courses carry on generating seamlessly.
+    The file records the curve by name, so custom curves must be added to
+    DIFFICULTY_CURVES first.
+    """
+    import numpy as np
+
+    if not isinstance(curve, str):
+        raise ValueError("Course files record curves by name, add the curve to DIFFICULTY_CURVES")
+    get_curve(curve)  # Fail before generating anything if the name is unknown
+
+    pipes = -(-pipes // chunk_size) * chunk_size
+    courses = []
+    for seed in seeds:
+        course = Course(seed, curve, chunk_size)
+        course.generate(pipes)
+        courses.append(course)
+    np.savez(path, seeds=np.array(seeds, dtype=np.uint32), curve=curve, chunk_size=chunk_size,
+             positions=np.array([course.positions[:pipes] for course in courses], dtype=np.int32),
+             gap_ys=np.array([course.gap_ys[:pipes] for course in courses], dtype=np.int16),
+             gaps=np.array([course.gaps[:pipes] for course in courses], dtype=np.int16),
+             coins=np.array([course.coins[:pipes] for course in courses], dtype=bool))
+
+
+def load_courses(path):
+    """Load courses saved by save_courses, returns {seed: Course}"""
+    import numpy as np
+
+    with np.load(path) as data:
+        curve = str(data['curve'])
+        chunk_size = int(data['chunk_size'])
+        courses = {}
+        for i, seed in enumerate(data['seeds']):
+            course = Course(int(seed), curve, chunk_size)
+            course.positions = data['positions'][i].tolist()
+            course.gap_ys = data['gap_ys'][i].tolist()
+            course.gaps = data['gaps'][i].tolist()
+            course.coins = data['coins'][i].tolist()
+            courses[course.seed] = course
+    return courses
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    save_parser = commands.add_parser('save', help="precompute courses into a file")
+    save_parser.add_argument('path')
+    save_parser.add_argument('--courses', type=int, default=64, help="number of seeds")
+    save_parser.add_argument('--first-seed', type=int, default=0)
+    save_parser.add_argument('--pipes', type=int, default=512, help="pipe pairs per course")
+    save_parser.add_argument('--curve', default=COURSE_DIFFICULTY, choices=sorted(DIFFICULTY_CURVES))
+
+    args = parser.parse_args()
+    seeds = range(args.first_seed, args.first_seed + args.courses)
+    save_courses(args.path, list(seeds), args.pipes, args.curve)
+    print(f"Saved {args.courses} courses of {args.pipes} pipe pairs to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
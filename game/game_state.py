@@ -4,9 +4,10 @@ Game state management
 
 import pygame
 from .constants import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, RED,
+    SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, RED, PIPE_SPEED,
     FONT_SIZE_LARGE, FONT_SIZE_MEDIUM, FONT_SIZE_SMALL
 )
+from .collision import sweep_from
 
 
 class GameState:
@@ -16,8 +17,8 @@ class GameState:
         self.next_state = None
     
     def handle_event(self, event):
-        """Handle input events"""
-        pass
+        """Handle input events, returns True if the event changed anything"""
+        return False
     
     def update(self):
         """Update state logic"""
@@ -34,9 +35,39 @@ class GameState:
     def reset_next_state(self):
         """Reset next state"""
         self.next_state = None
+    
+    def is_static(self):
+        """Check if the screen only changes in response to input"""
+        return False
+
+
+class StaticState(GameState):
+    """State whose screen is rendered once and then reused every frame"""
+    
+    def __init__(self):
+        super().__init__()
+        self.rendered = None
+    
+    def is_static(self):
+        """Check if the screen only changes in response to input"""
+        return True
+    
+    def render(self, surface):
+        """Render the screen onto surface"""
+        pass
+    
+    def draw(self, screen):
+        """Draw state from the pre-rendered screen"""
+        if self.rendered is None:
+            if isinstance(screen, pygame.Surface):
+                self.rendered = pygame.Surface(screen.get_size(), 0, screen)
+            else:
+                self.rendered = pygame.Surface(screen.get_size())  # Texture canvas
+            self.render(self.rendered)
+        screen.blit(self.rendered, (0, 0))
 
 
-class MenuState(GameState):
+class MenuState(StaticState):
     """Start menu state"""
     
     def __init__(self):
@@ -59,12 +90,15 @@ class MenuState(GameState):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_SPACE or event.key == pygame.K_RETURN:
                 self.next_state = 'playing'
+                return True
         elif event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:  # Left click
                 self.next_state = 'playing'
+                return True
+        return False
     
-    def draw(self, screen):
-        """Draw menu"""
+    def render(self, screen):
+        """Render menu"""
         if not self.font_large:
             self.init_fonts()
         
@@ -89,16 +123,21 @@ class MenuState(GameState):
 class PlayingState(GameState):
     """Game playing state"""
     
-    def __init__(self, bird, pipes, coin_manager, coin_sound=None, collision_sound=None):
+    # Heart images for the lives display, by whether the heart polygon is drawn
+    heart_images = {}
+    
+    def __init__(self, bird, pipes, coin_manager, audio=None, quality=None):
         super().__init__()
         self.bird = bird
         self.pipes = pipes
         self.coin_manager = coin_manager
-        self.coin_sound = coin_sound  # Store sound reference
-        self.collision_sound = collision_sound  # Store collision sound reference
+        self.audio = audio  # AudioManager used for sound effects
+        self.quality = quality  # QualityGovernor deciding which effects to draw
+        self.drawn_rects = []  # Screen areas drawn last frame, cleared instead of a full fill
         self.score = 0
         self.font_medium = None
         self.font_small = None
+        self.hud_texts = {}  # HUD line -> (text, rendered surface), re-rendered only on change
         self.hit_pipe_pairs = set()  # Track which pipe pairs have been hit
     
     def init_fonts(self):
@@ -110,21 +149,62 @@ class PlayingState(GameState):
             self.font_medium = pygame.font.SysFont('arial', FONT_SIZE_MEDIUM)
             self.font_small = pygame.font.SysFont('arial', FONT_SIZE_SMALL)
     
+    def render_text(self, line, font, text, color):
+        """Render a HUD line, reusing the last surface while its text is unchanged"""
+        cached = self.hud_texts.get(line)
+        if cached is None or cached[0] != text:
+            cached = (text, font.render(text, True, color))
+            self.hud_texts[line] = cached
+        return cached[1]
+    
+    @classmethod
+    def get_heart_image(cls, polygon=True):
+        """Get the image of one heart, drawing it only the first time"""
+        image = cls.heart_images.get(polygon)
+        if image is None:
+            image = pygame.Surface((21, 21), pygame.SRCALPHA)
+            pygame.draw.circle(image, RED, (10, 10), 10)
+            if polygon:
+                # Simple heart shape
+                pygame.draw.polygon(image, RED, [
+                    (10, 10), (5, 5), (0, 10), (10, 20), (20, 10), (15, 5)
+                ])
+            cls.heart_images[polygon] = image
+        return image
+    
     def handle_event(self, event):
         """Handle game input"""
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_SPACE:
                 self.bird.jump()
+                return True
         elif event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:  # Left click
                 self.bird.jump()
+                return True
+        return False
     
-    def update(self):
-        """Update game logic"""
+    def play_sound(self, name):
+        """Play a sound effect if audio is available"""
+        if self.audio:
+            self.audio.play(name)
+    
+    def update(self, frames_ahead=0):
+        """Update game logic
+        
+        Collisions are swept along the bird's path this frame, relative to pipes and
+        coins (which moved PIPE_SPEED to the left), so fast movement can't skip them.
+        frames_ahead is how many frames pipes and coins are behind (see Game.advance).
+        """
         # Only check collisions if bird is alive and not invincible
         if not self.bird.alive or self.bird.invincible:
             return
         
+        # Bird path as seen from the pipes
+        world_offset = PIPE_SPEED * frames_ahead
+        bird_rect = self.bird.rect.move(world_offset, 0)
+        previous_rect = self.bird.previous_rect.move(world_offset - PIPE_SPEED, 0)
+        
         # Check collisions with pipes
         for pipe_pair in self.pipes:
             # Skip if this pipe pair already caused damage
@@ -135,10 +215,8 @@ class PlayingState(GameState):
                 # Use collision_rect instead of rect for collision detection
                 # (excludes horizontal padding extensions)
                 collision_rect = getattr(pipe, 'collision_rect', pipe.rect)
-                if self.bird.rect.colliderect(collision_rect):
-                    # Play collision sound if available
-                    if self.collision_sound:
-                        self.collision_sound.play()
+                if sweep_from(previous_rect, bird_rect, collision_rect) is not None:
+                    self.play_sound('collision')
                     self.bird.lose_life()
                     # Mark this pipe pair as hit
                     self.hit_pipe_pairs.add(id(pipe_pair))
@@ -150,17 +228,13 @@ class PlayingState(GameState):
                     return  # Exit early to prevent multiple collisions in same frame
         
         # Check coin collection
-        if self.coin_manager.check_collision(self.bird.rect):
+        if self.coin_manager.check_collision(bird_rect, previous_rect, frames_ahead):
             self.score += 10  # Coin score
-            # Play coin sound if available
-            if self.coin_sound:
-                self.coin_sound.play()
+            self.play_sound('coin')
         
         # Check if bird hit top or bottom
         if self.bird.rect.top <= 0 or self.bird.rect.bottom >= SCREEN_HEIGHT:
-            # Play collision sound if available
-            if self.collision_sound:
-                self.collision_sound.play()
+            self.play_sound('collision')
             self.bird.lose_life()
             if not self.bird.alive:
                 self.next_state = 'game_over'
@@ -170,53 +244,53 @@ class PlayingState(GameState):
         if not self.font_medium:
             self.init_fonts()
         
-        screen.fill((135, 206, 235))  # Sky blue background
+        # Clear only what was drawn last frame when quality asks to skip the full fill
+        if self.quality is None or self.quality.get_setting('full_clear') or not self.drawn_rects:
+            screen.fill((135, 206, 235))  # Sky blue background
+        else:
+            for rect in self.drawn_rects:
+                screen.fill((135, 206, 235), rect)
+        drawn = []
         
         # Draw pipes
         for pipe_pair in self.pipes:
             for pipe in pipe_pair.get_sprites():
-                screen.blit(pipe.image, pipe.rect)
+                drawn.append(screen.blit(pipe.image, pipe.rect))
         
         # Draw coins
-        self.coin_manager.draw(screen)
+        drawn.extend(self.coin_manager.draw(screen))
         
         # Draw bird
-        screen.blit(self.bird.image, self.bird.rect)
+        drawn.append(screen.blit(self.bird.image, self.bird.rect))
         
         # Draw UI
         # Score
-        score_text = self.font_medium.render(f"Score: {self.score}", True, WHITE)
-        screen.blit(score_text, (10, 10))
+        score_text = self.render_text('score', self.font_medium, f"Score: {self.score}", WHITE)
+        drawn.append(screen.blit(score_text, (10, 10)))
         
         # Coins collected
-        coins_text = self.font_small.render(f"Coins: {self.coin_manager.get_collected_count()}", True, WHITE)
-        screen.blit(coins_text, (10, 50))
+        coins_text = self.render_text('coins', self.font_small,
+                                      f"Coins: {self.coin_manager.get_collected_count()}", WHITE)
+        drawn.append(screen.blit(coins_text, (10, 50)))
         
         # Lives
-        lives_text = self.font_small.render(f"Lives: {self.bird.get_lives()}", True, RED)
-        screen.blit(lives_text, (10, 80))
+        lives_text = self.render_text('lives', self.font_small, f"Lives: {self.bird.get_lives()}", RED)
+        drawn.append(screen.blit(lives_text, (10, 80)))
         
         # Draw hearts for lives
-        heart_size = 20
+        heart = self.get_heart_image(self.quality is None or self.quality.get_setting('heart_polygons'))
         for i in range(self.bird.get_lives()):
             heart_x = SCREEN_WIDTH - 30 - (i * 30)
-            pygame.draw.circle(screen, RED, (heart_x, 20), heart_size // 2)
-            # Simple heart shape
-            pygame.draw.polygon(screen, RED, [
-                (heart_x, 20),
-                (heart_x - 5, 15),
-                (heart_x - 10, 20),
-                (heart_x, 30),
-                (heart_x + 10, 20),
-                (heart_x + 5, 15)
-            ])
+            drawn.append(screen.blit(heart, (heart_x - 10, 10)))
+        
+        self.drawn_rects = drawn
     
     def get_score(self):
         """Get current score"""
         return self.score
 
 
-class GameOverState(GameState):
+class GameOverState(StaticState):
     """Game over state"""
     
     def __init__(self, final_score, coins_collected):
@@ -240,12 +314,15 @@ class GameOverState(GameState):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_SPACE or event.key == pygame.K_RETURN:
                 self.next_state = 'menu'
+                return True
         elif event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:  # Left click
                 self.next_state = 'menu'
+                return True
+        return False
     
-    def draw(self, screen):
-        """Draw game over screen"""
+    def render(self, screen):
+        """Render game over screen"""
         if not self.font_large:
             self.init_fonts()
         
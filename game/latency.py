@@ -0,0 +1,123 @@
+"""
+Input-to-photon latency measurement and late-latched input sampling
+"""
+
+import time
+from collections import deque
+import pygame
+from .constants import (
+    FPS, INPUT_LATENCY_HISTORY, LATE_LATCH_MARGIN_MS, LATE_LATCH_POLL_MS
+)
+
+
+def stamp_events(events):
+    """Pair each event with the current time"""
+    now = time.perf_counter()
+    return [(event, now) for event in events]
+
+
+def poll_events():
+    """Get pending events, each paired with the time it was read"""
+    return stamp_events(pygame.event.get())
+
+
+def summarize(samples):
+    """Get mean, p95 and max of durations in seconds, in milliseconds"""
+    if not samples:
+        return {'mean_ms': None, 'p95_ms': None, 'max_ms': None}
+
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return {
+        'mean_ms': sum(ordered) * 1000.0 / len(ordered),
+        'p95_ms': p95 * 1000.0,
+        'max_ms': ordered[-1] * 1000.0,
+    }
+
+
+class InputLatencyTracker:
+    """Measures time from an input event to the flip of the frame showing it
+
+    Timestamps are taken when events are read. The frame pacer reads them every
+    LATE_LATCH_POLL_MS while it waits, with or without late latching, so time spent
+    waiting for the next frame is included in both.
+    """
+
+    def __init__(self, history=INPUT_LATENCY_HISTORY):
+        self.pending = []  # Timestamps of inputs not shown on screen yet
+        self.latencies = deque(maxlen=history)
+
+    def mark_input(self, timestamp):
+        """Remember when an input the game acted on was read"""
+        self.pending.append(timestamp)
+
+    def discard_pending(self):
+        """Forget inputs that will not show up on screen"""
+        self.pending.clear()
+
+    def mark_flip(self):
+        """Record latency for every input reflected in the frame just flipped"""
+        if not self.pending:
+            return
+        now = time.perf_counter()
+        for timestamp in self.pending:
+            self.latencies.append(now - timestamp)
+        self.pending.clear()
+
+    def get_stats(self):
+        """Get input-to-flip latency in milliseconds"""
+        return {'samples': len(self.latencies), **summarize(self.latencies)}
+
+
+class LateLatchPacer:
+    """Frame limiter that sleeps until just before the frame deadline, then samples input
+
+    Events that arrive while waiting are read in short slices so their timestamps
+    stay close to when they happened. With late_latch False there is no work
+    estimate or margin: it waits for the start of the next frame like Clock.tick(),
+    polling as it goes.
+    """
+
+    def __init__(self, fps=FPS, late_latch=True):
+        self.period = 1.0 / fps
+        self.late_latch = late_latch
+        self.next_flip = None
+        self.sample_time = None
+        self.work_estimate = 0.0  # Time from input sample until the frame is ready to flip
+
+    def wait_for_input(self):
+        """Wait for the latch point and return (event, timestamp) pairs"""
+        events = []
+        if self.next_flip is not None:
+            latch_time = self.next_flip
+            if self.late_latch:
+                latch_time -= self.work_estimate + LATE_LATCH_MARGIN_MS / 1000.0
+            while True:
+                events.extend(poll_events())
+                remaining = latch_time - time.perf_counter()
+                if remaining <= 0:
+                    break
+                time.sleep(min(remaining, LATE_LATCH_POLL_MS / 1000.0))
+
+        events.extend(poll_events())
+        self.sample_time = time.perf_counter()
+        return events
+
+    def frame_presented(self, ready_time):
+        """Update work estimate and deadline after a flip
+
+        ready_time is when the frame was drawn, just before the flip call, so any
+        time the flip spends blocked on vsync is not counted as work.
+        """
+        if self.late_latch and self.sample_time is not None:
+            work = ready_time - self.sample_time
+            if work > self.work_estimate:
+                self.work_estimate = work  # React to slow frames immediately
+            else:
+                self.work_estimate += (work - self.work_estimate) * 0.05
+
+        now = time.perf_counter()
+        if self.next_flip is None or now - self.next_flip > self.period:
+            self.next_flip = now + self.period  # Fell behind, start a new schedule
+        else:
+            self.next_flip += self.period
@@ -5,163 +5,180 @@ Main game loop and entry point
 import pygame
 import sys
 import os
-import random
+import time
 from .constants import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, PIPE_SPAWN_DISTANCE, BIRD_IMAGE_PATH, COIN_SPAWN_PROBABILITY
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, BIRD_IMAGE_PATH, COIN_SOUND_PATH, COLLISION_SOUND_PATH,
+    BACKGROUND_MUSIC_PATH, LATE_LATCH_INPUT, LATENCY_REPORT, IDLE_THROTTLE, IDLE_TICK_MS,
+    RENDERER_BACKEND
 )
-from .bird import Bird
-from .pipes import PipePair
-from .coins import CoinManager
-from .game_state import MenuState, PlayingState, GameOverState
+from .core import GameCore
+from .audio import AudioManager
+from .latency import InputLatencyTracker, LateLatchPacer, stamp_events
+from .renderer import TextureCanvas
 
 
-class Game:
-    """Main game class"""
+class Game(GameCore):
+    """Main game class, the game rules in a window with sound"""
     
-    def __init__(self):
+    def __init__(self, late_latch=LATE_LATCH_INPUT, headless=False, idle_throttle=IDLE_THROTTLE,
+                 renderer=RENDERER_BACKEND):
+        if headless:
+            # Run without a window or sound device (CI, training, servers)
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        AudioManager.pre_init()  # Low-latency mixer settings, must precede pygame.init()
         pygame.init()
-        pygame.mixer.init()  # Initialize audio mixer
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Flappy Bird - Collect Coins!")
+        if not pygame.mixer.get_init():
+            try:
+                pygame.mixer.init()  # Initialize audio mixer
+            except pygame.error:
+                print("Warning: Could not initialize audio mixer")
+        
+        # Draw with GPU textures if asked for (software renderer when headless), else onto the window surface
+        self.canvas = None
+        if renderer == 'texture':
+            try:
+                self.canvas = TextureCanvas("Flappy Bird - Collect Coins!", accelerated=not headless)
+            except pygame.error as error:
+                print(f"Warning: Could not create texture renderer ({error}), using surfaces")
+        if self.canvas:
+            self.screen = self.canvas
+        else:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("Flappy Bird - Collect Coins!")
         self.clock = pygame.time.Clock()
         
         # Get bird image path (check if file exists)
         bird_image = BIRD_IMAGE_PATH if os.path.exists(BIRD_IMAGE_PATH) else None
         
-        # Load sound effects
-        from .constants import COIN_SOUND_PATH, COLLISION_SOUND_PATH
-        self.coin_sound = None
-        if os.path.exists(COIN_SOUND_PATH):
-            try:
-                self.coin_sound = pygame.mixer.Sound(COIN_SOUND_PATH)
-            except pygame.error:
-                print(f"Warning: Could not load sound {COIN_SOUND_PATH}")
+        # Load sound effects onto their own channel pools and start background music
+        audio = AudioManager()
+        audio.load('coin', COIN_SOUND_PATH)
+        audio.load('collision', COLLISION_SOUND_PATH)
+        audio.play_music(BACKGROUND_MUSIC_PATH)
         
-        # Load collision sound
-        self.collision_sound = None
-        if os.path.exists(COLLISION_SOUND_PATH):
-            try:
-                self.collision_sound = pygame.mixer.Sound(COLLISION_SOUND_PATH)
-            except pygame.error:
-                print(f"Warning: Could not load sound {COLLISION_SOUND_PATH}")
+        # Game objects and rules
+        super().__init__(bird_image, audio)
         
-        # Load and start background music
-        from .constants import BACKGROUND_MUSIC_PATH
-        if os.path.exists(BACKGROUND_MUSIC_PATH):
-            try:
-                pygame.mixer.music.load(BACKGROUND_MUSIC_PATH)
-                pygame.mixer.music.play(-1)  # -1 means loop infinitely
-            except pygame.error:
-                print(f"Warning: Could not load background music {BACKGROUND_MUSIC_PATH}")
+        # Input latency instrumentation and optional late-latched input sampling
+        self.input_latency = InputLatencyTracker()
+        self.late_latch = late_latch
+        self.pacer = LateLatchPacer(FPS, late_latch)
         
-        # Game objects
-        self.bird = Bird(image_path=bird_image)
-        self.pipes = []
-        self.coin_manager = CoinManager()
+        # Static screens are only redrawn on input or every IDLE_TICK_MS
+        self.idle_throttle = idle_throttle
+        self.idle_drawn_state = None  # Static state currently on screen
+    
+    def handle_events(self, events):
+        """Dispatch (event, timestamp) pairs to the current state"""
+        for event, timestamp in events:
+            if event.type == pygame.QUIT:
+                self.running = False
+            
+            # Only inputs the state acted on change what is shown
+            if self.current_state.handle_event(event):
+                self.input_latency.mark_input(timestamp)
+    
+    def step(self, events=(), update_world=True):
+        """Advance and draw one frame without flipping or pacing
+        
+        events are (event, timestamp) pairs, see latency.stamp_events.
+        """
+        # Handle events
+        self.handle_events(events)
+        
+        # Handle state transitions
+        self.handle_state_transition()
         
-        # Game state
-        self.current_state = MenuState()
-        self.running = True
+        # Update game objects based on state
+        if update_world:
+            self.update_world()
+        self.update_bird()
         
-        # Pipe spawning
-        self.last_pipe_x = SCREEN_WIDTH
-        self.pipe_spawn_timer = 0
+        # Update state
+        self.current_state.update()
+        
+        # Draw everything
+        self.current_state.draw(self.screen)
     
-    def reset_game(self):
-        """Reset game to initial state"""
-        self.bird.reset()
-        self.pipes = []
-        self.coin_manager.reset()
-        self.last_pipe_x = SCREEN_WIDTH
-        self.pipe_spawn_timer = 0
+    def present(self):
+        """Show the frame that was drawn"""
+        if self.canvas:
+            self.canvas.present()
+        else:
+            pygame.display.flip()
     
-    def spawn_pipe_pair(self):
-        """Spawn a new pipe pair"""
-        pipe_pair = PipePair(self.last_pipe_x + PIPE_SPAWN_DISTANCE)
-        self.pipes.append(pipe_pair)
-        self.last_pipe_x = pipe_pair.x
+    def idle_frame(self):
+        """Block until input on a static screen, redrawing only when needed"""
+        state = self.current_state
+        if self.idle_drawn_state is not state:
+            state.draw(self.screen)
+            self.present()
+            self.input_latency.mark_flip()
+            self.idle_drawn_state = state
         
-        # Randomly spawn coin in the gap (based on probability)
-        if random.random() < COIN_SPAWN_PROBABILITY:
-            gap_center_y = pipe_pair.get_gap_center()
-            coin_x = pipe_pair.x + 40  # Center of pipe width
-            coin_y = gap_center_y
-            self.coin_manager.spawn_coin(coin_x, coin_y)
-    
-    def update_pipes(self):
-        """Update all pipes and remove off-screen ones"""
-        for pipe_pair in self.pipes[:]:
-            pipe_pair.update()
-            if pipe_pair.is_off_screen():
-                self.pipes.remove(pipe_pair)
+        event = pygame.event.wait(IDLE_TICK_MS)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events = stamp_events(events + pygame.event.get())
+        self.handle_events(events)
+        self.handle_state_transition()
+        if self.current_state is state:
+            # Nothing changed, so no input read here is about to be shown
+            self.input_latency.discard_pending()
+        
+        # Redraw on the animation tick (no events) or when the window was uncovered
+        if not events or any(event.type == pygame.WINDOWEXPOSED for event, _ in events):
+            self.idle_drawn_state = None
+        self.clock.tick()
     
-    def handle_state_transition(self):
-        """Handle state transitions"""
-        next_state = self.current_state.get_next_state()
-        if next_state:
-            self.current_state.reset_next_state()
-            
-            if next_state == 'playing':
-                self.reset_game()
-                self.current_state = PlayingState(
-                    self.bird, self.pipes, self.coin_manager, self.coin_sound, self.collision_sound
-                )
-            elif next_state == 'game_over':
-                playing_state = self.current_state
-                final_score = playing_state.get_score()
-                coins_collected = self.coin_manager.get_collected_count()
-                self.current_state = GameOverState(final_score, coins_collected)
-            elif next_state == 'menu':
-                self.reset_game()
-                self.current_state = MenuState()
+    def report_latency(self):
+        """Print input-to-flip latency and the configured audio latency"""
+        stats = self.input_latency.get_stats()
+        mode = "late latch" if self.late_latch else "default"
+        if stats['samples']:
+            print(f"Input latency ({mode}): mean {stats['mean_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, "
+                  f"max {stats['max_ms']:.1f} ms over {stats['samples']} inputs")
+        else:
+            print(f"Input latency ({mode}): no inputs measured")
+        
+        audio = self.audio.get_latency_stats()
+        if audio['buffer_ms'] is not None:
+            print(f"Audio latency: {audio['buffer_ms']:.1f} ms mixer buffer (configured, not measured), "
+                  f"{audio['dropped']} rate-limited plays dropped")
     
     def run(self):
         """Main game loop"""
         while self.running:
-            # Handle events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                
-                self.current_state.handle_event(event)
+            if self.idle_throttle and self.current_state.is_static():
+                self.idle_frame()
+                continue
             
-            # Handle state transitions
-            self.handle_state_transition()
+            self.idle_drawn_state = None
+            frame_start = time.perf_counter()
+            if self.late_latch:
+                # Move the world first, then wait and sample input right before physics
+                self.update_world()
+            # Both modes poll input while waiting for the frame, so latencies are comparable
+            wait_start = time.perf_counter()
+            events = self.pacer.wait_for_input()
+            wait_time = time.perf_counter() - wait_start
             
-            # Update game objects based on state
-            if isinstance(self.current_state, PlayingState):
-                # Spawn pipes
-                self.pipe_spawn_timer += 1
-                if self.pipe_spawn_timer >= PIPE_SPAWN_DISTANCE // 3:  # Adjust spawn rate
-                    self.spawn_pipe_pair()
-                    self.pipe_spawn_timer = 0
-                
-                # Update game objects
-                self.bird.update()
-                self.update_pipes()
-                self.coin_manager.update()
-                self.coin_manager.remove_off_screen(SCREEN_WIDTH)
-                
-                # Update score when passing pipes
-                for pipe_pair in self.pipes:
-                    if pipe_pair.check_passed(self.bird.rect.x):
-                        if isinstance(self.current_state, PlayingState):
-                            self.current_state.score += 1
+            self.step(events, update_world=not self.late_latch)
             
-            # Update state
-            self.current_state.update()
+            ready_time = time.perf_counter()
+            self.present()
+            self.input_latency.mark_flip()
             
-            # Draw everything
-            self.current_state.draw(self.screen)
+            # The flip is part of a frame's cost (the main one with software surfaces),
+            # only the pacer's deliberate wait is left out; clock.tick() does not sleep
+            if self.quality.record_frame(time.perf_counter() - frame_start - wait_time):
+                self.apply_quality()
             
-            # Draw game objects in playing state
-            if isinstance(self.current_state, PlayingState):
-                # Objects are drawn by PlayingState, but we ensure they're updated
-                pass
-            
-            pygame.display.flip()
-            self.clock.tick(FPS)
+            self.pacer.frame_presented(ready_time)
+            self.clock.tick()  # Pacing is done by the pacer
         
+        if LATENCY_REPORT:
+            self.report_latency()
         pygame.quit()
         sys.exit()
 
@@ -0,0 +1,88 @@
+"""
+Zero-copy pixel observations for learning agents
+"""
+
+import numpy as np
+import pygame
+from .constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, OBSERVATION_DOWNSAMPLE, OBSERVATION_GRAYSCALE,
+    OBSERVATION_STACK
+)
+
+# Integer luma weights (sum to 256, so the result is shifted right by 8)
+GRAY_WEIGHTS = (77, 150, 29)
+
+
+def frame_view(surface):
+    """Get a (height, width, 3) NumPy view of a surface's pixels, without copying
+
+    The surface stays locked for as long as the view or any view made from it is
+    alive (Surface.unlock() does not release it), so it cannot be blitted or
+    flipped until they are all deleted.
+    """
+    return pygame.surfarray.pixels3d(surface).transpose(1, 0, 2)  # surfarray is indexed (x, y)
+
+
+class PixelObserver:
+    """Downsamples rendered frames into a ring buffer of recent observations
+
+    All buffers are allocated once; observing a frame reads the screen through a
+    strided view and writes the result straight into the ring buffer.
+    """
+
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT), downsample=OBSERVATION_DOWNSAMPLE,
+                 grayscale=OBSERVATION_GRAYSCALE, stack=OBSERVATION_STACK):
+        self.downsample = downsample
+        self.grayscale = grayscale
+        width = -(-size[0] // downsample)  # Ceiling division matches [::downsample]
+        height = -(-size[1] // downsample)
+        shape = (height, width) if grayscale else (height, width, 3)
+
+        self.frames = np.zeros((stack,) + shape, dtype=np.uint8)
+        self.index = stack - 1  # Slot holding the newest frame
+        self.stacked = np.zeros_like(self.frames)
+        self.order = np.empty(stack, dtype=np.intp)
+        self.offsets = np.arange(1, stack + 1, dtype=np.intp)
+
+        # Scratch buffers for the grayscale conversion
+        self.gray = np.empty((height, width), dtype=np.uint16)
+        self.channel = np.empty((height, width), dtype=np.uint16)
+
+    def observe(self, surface):
+        """Add a frame from surface to the stack and return it
+
+        The returned array is a slot of the ring buffer and is overwritten once
+        the stack wraps around.
+        """
+        self.index = (self.index + 1) % len(self.frames)
+        slot = self.frames[self.index]
+
+        pixels = frame_view(surface)
+        view = pixels[::self.downsample, ::self.downsample]
+        if self.grayscale:
+            np.multiply(view[..., 0], GRAY_WEIGHTS[0], out=self.gray, dtype=np.uint16)
+            for c in (1, 2):
+                np.multiply(view[..., c], GRAY_WEIGHTS[c], out=self.channel, dtype=np.uint16)
+                np.add(self.gray, self.channel, out=self.gray)
+            np.right_shift(self.gray, 8, out=self.gray)
+            np.copyto(slot, self.gray, casting='unsafe')
+        else:
+            np.copyto(slot, view)
+        # Drop the views so the surface is unlocked before it is drawn to again
+        del pixels, view
+        return slot
+
+    def get_stack(self):
+        """Get recent frames ordered oldest to newest
+
+        The returned array is reused by the next call.
+        """
+        np.add(self.offsets, self.index, out=self.order)
+        np.remainder(self.order, len(self.frames), out=self.order)
+        np.take(self.frames, self.order, axis=0, out=self.stacked)
+        return self.stacked
+
+    def reset(self):
+        """Clear the frame stack (e.g. at the start of an episode)"""
+        self.frames.fill(0)
+        self.index = len(self.frames) - 1
@@ -6,7 +6,7 @@ import pygame
 import random
 from .constants import (
     SCREEN_WIDTH, SCREEN_HEIGHT, PIPE_WIDTH, PIPE_GAP,
-    PIPE_SPEED, PIPE_SPAWN_DISTANCE, PIPE_MIN_HEIGHT, PIPE_MAX_HEIGHT,
+    PIPE_SPEED, PIPE_MIN_HEIGHT, PIPE_MAX_HEIGHT,
     PIPE_COLOR, PIPE_HORIZONTAL_PADDING
 )
 
@@ -14,7 +14,7 @@ from .constants import (
 class Pipe(pygame.sprite.Sprite):
     """Single pipe obstacle"""
     
-    def __init__(self, x, gap_y, is_top=False):
+    def __init__(self, x, gap_y, is_top=False, bands=True, gap=PIPE_GAP):
         super().__init__()
         self.is_top = is_top
         
@@ -69,11 +69,12 @@ class Pipe(pygame.sprite.Sprite):
             
             # Draw horizontal bands for texture (only on right side, not in highlight area)
             # Skip the highlight area on the left side
-            for y in range(pipe_y + 20, total_height, 20):
-                # Draw band only on the right side (after highlight area)
-                pygame.draw.line(self.image, PIPE_COLOR, 
-                               (pipe_x + highlight_width + 5, y), 
-                               (pipe_x + PIPE_WIDTH-5, y), 1)
+            if bands:
+                for y in range(pipe_y + 20, total_height, 20):
+                    # Draw band only on the right side (after highlight area)
+                    pygame.draw.line(self.image, PIPE_COLOR, 
+                                   (pipe_x + highlight_width + 5, y), 
+                                   (pipe_x + PIPE_WIDTH-5, y), 1)
             
             self.rect = self.image.get_rect()
             # Adjust x position to account for padding (center the pipe body)
@@ -84,7 +85,7 @@ class Pipe(pygame.sprite.Sprite):
             self.collision_rect = pygame.Rect(x, 0, PIPE_WIDTH, total_height)
         else:
             # Bottom pipe (rises from bottom) - Mario style with horizontal padding
-            height = SCREEN_HEIGHT - (gap_y + PIPE_GAP)
+            height = SCREEN_HEIGHT - (gap_y + gap)
             cap_height = 20
             
             # Add horizontal padding to image width
@@ -125,11 +126,12 @@ class Pipe(pygame.sprite.Sprite):
                             (pipe_x, height - highlight_height, highlight_width, highlight_height))
             
             # Draw horizontal bands for texture (only on right side, not in highlight area)
-            for y in range(20, height, 20):
-                # Draw band only on the right side (after highlight area)
-                pygame.draw.line(self.image, PIPE_COLOR, 
-                               (pipe_x + highlight_width + 5, y), 
-                               (pipe_x + PIPE_WIDTH-5, y), 1)
+            if bands:
+                for y in range(20, height, 20):
+                    # Draw band only on the right side (after highlight area)
+                    pygame.draw.line(self.image, PIPE_COLOR, 
+                                   (pipe_x + highlight_width + 5, y), 
+                                   (pipe_x + PIPE_WIDTH-5, y), 1)
             
             # Draw pipe cap/rim (bottom part, at the opening)
             cap_y = height
@@ -149,13 +151,13 @@ class Pipe(pygame.sprite.Sprite):
         
         self.passed = False
     
-    def update(self):
+    def update(self, frames=1):
         """Move pipe to the left"""
-        self.rect.x -= PIPE_SPEED
+        self.rect.x -= PIPE_SPEED * frames
         
         # Update collision rect position to match pipe movement
         if hasattr(self, 'collision_rect'):
-            self.collision_rect.x -= PIPE_SPEED
+            self.collision_rect.x -= PIPE_SPEED * frames
         
         # Remove pipe if off screen
         if self.rect.right < 0:
@@ -165,16 +167,18 @@ class Pipe(pygame.sprite.Sprite):
 class PipePair:
     """Pair of top and bottom pipes with a gap"""
     
-    def __init__(self, x):
+    def __init__(self, x, bands=True, gap_y=None, gap=PIPE_GAP):
         self.x = x
-        # Random gap position
-        gap_y = random.randint(PIPE_MIN_HEIGHT, PIPE_MAX_HEIGHT)
+        # Random gap position unless one is given
+        if gap_y is None:
+            gap_y = random.randint(PIPE_MIN_HEIGHT, PIPE_MAX_HEIGHT)
         self.gap_y = gap_y
-        self.gap_center = gap_y + PIPE_GAP // 2
+        self.gap = gap
+        self.gap_center = gap_y + gap // 2
         
         # Create top and bottom pipes
-        self.top_pipe = Pipe(x, gap_y, is_top=True)
-        self.bottom_pipe = Pipe(x, gap_y, is_top=False)
+        self.top_pipe = Pipe(x, gap_y, is_top=True, bands=bands, gap=gap)
+        self.bottom_pipe = Pipe(x, gap_y, is_top=False, bands=bands, gap=gap)
         
         self.passed = False
     
@@ -182,11 +186,19 @@ class PipePair:
         """Get both pipe sprites"""
         return [self.top_pipe, self.bottom_pipe]
     
-    def update(self):
+    def update(self, frames=1):
         """Update both pipes"""
-        self.x -= PIPE_SPEED
-        self.top_pipe.update()
-        self.bottom_pipe.update()
+        self.x -= PIPE_SPEED * frames
+        self.top_pipe.update(frames)
+        self.bottom_pipe.update(frames)
+    
+    def move_to(self, x):
+        """Move both pipes so the pair is at x"""
+        dx = x - self.x
+        self.x = x
+        for pipe in self.get_sprites():
+            pipe.rect.x += dx
+            pipe.collision_rect.x += dx
     
     def check_passed(self, bird_x):
         """Check if bird has passed this pipe pair"""
@@ -0,0 +1,76 @@
+"""
+Adaptive quality governor
+"""
+
+from collections import deque
+from .constants import (
+    FPS, COIN_ROTATION_SPEED, QUALITY_GOVERNOR_ENABLED, QUALITY_WINDOW,
+    QUALITY_DOWNGRADE_RATIO, QUALITY_UPGRADE_RATIO, QUALITY_COOLDOWN
+)
+
+# Quality levels from best to cheapest
+QUALITY_LEVELS = [
+    {'name': 'high', 'coin_rotation_step': COIN_ROTATION_SPEED,
+     'pipe_bands': True, 'heart_polygons': True, 'full_clear': True},
+    {'name': 'medium', 'coin_rotation_step': 30,  # 12 rotation frames instead of 72
+     'pipe_bands': True, 'heart_polygons': True, 'full_clear': True},
+    {'name': 'low', 'coin_rotation_step': 0,  # Static coins
+     'pipe_bands': False, 'heart_polygons': False, 'full_clear': True},
+    {'name': 'minimal', 'coin_rotation_step': 0,
+     'pipe_bands': False, 'heart_polygons': False, 'full_clear': False},
+]
+
+
+class QualityGovernor:
+    """Watches frame times and steps visual quality down or up to hold the frame rate"""
+
+    def __init__(self, fps=FPS, enabled=QUALITY_GOVERNOR_ENABLED):
+        self.budget = 1.0 / fps
+        self.enabled = enabled
+        self.frame_times = deque(maxlen=QUALITY_WINDOW)
+        self.level = 0
+        self.cooldown = 0
+
+    def record_frame(self, frame_time):
+        """Add a frame's work time in seconds, returns True if the level changed"""
+        if not self.enabled:
+            return False
+
+        self.frame_times.append(frame_time)
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return False
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return False
+
+        average = sum(self.frame_times) / len(self.frame_times)
+        # Separate thresholds for stepping down and up keep the level from flickering
+        if average > self.budget * QUALITY_DOWNGRADE_RATIO and self.level < len(QUALITY_LEVELS) - 1:
+            self.level += 1
+        elif average < self.budget * QUALITY_UPGRADE_RATIO and self.level > 0:
+            self.level -= 1
+        else:
+            return False
+
+        # Start measuring fresh at the new level
+        self.frame_times.clear()
+        self.cooldown = QUALITY_COOLDOWN
+        return True
+
+    def set_level(self, level):
+        """Force a quality level (0 is best)"""
+        self.level = max(0, min(level, len(QUALITY_LEVELS) - 1))
+        self.frame_times.clear()
+        self.cooldown = QUALITY_COOLDOWN
+
+    def get_level(self):
+        """Get current quality level (0 is best)"""
+        return self.level
+
+    def get_level_name(self):
+        """Get name of current quality level"""
+        return QUALITY_LEVELS[self.level]['name']
+
+    def get_setting(self, name):
+        """Get a setting of the current quality level"""
+        return QUALITY_LEVELS[self.level][name]
@@ -0,0 +1,86 @@
+"""
+Hardware-accelerated drawing through the SDL2 Renderer/Texture API
+"""
+
+import weakref
+import pygame
+from .constants import SCREEN_WIDTH, SCREEN_HEIGHT, WINDOW_SIZE
+
+try:
+    from pygame._sdl2.video import Window, Renderer, Texture
+except ImportError:  # Not part of every pygame build (e.g. the web build)
+    Window = Renderer = Texture = None
+
+
+class TextureCanvas:
+    """Stand-in for the screen Surface that draws with an SDL2 renderer
+
+    Supports the Surface methods game states draw with (fill, blit and
+    get_size). Each surface is uploaded to a texture the first time it is drawn
+    and the texture is reused for as long as the surface lives, so art must not
+    be drawn on after it has been shown. The game is drawn at SCREEN_WIDTH x
+    SCREEN_HEIGHT and scaled by the renderer to fit the window.
+    """
+
+    def __init__(self, title="", size=(SCREEN_WIDTH, SCREEN_HEIGHT), window_size=WINDOW_SIZE,
+                 accelerated=True):
+        if Renderer is None:
+            raise pygame.error("pygame._sdl2.video is not available")
+        self.window = Window(title, size=window_size, resizable=True)
+        # accelerated=0 forces the software renderer (headless CI), -1 lets SDL choose
+        self.renderer = Renderer(self.window, accelerated=-1 if accelerated else 0)
+        self.renderer.logical_size = size  # Letterboxed scaling to any window size
+        self.size = size
+        self.textures = weakref.WeakKeyDictionary()  # Surface -> Texture
+        self.cleared = False  # Whether the frame being drawn was cleared yet
+        self.uploads = 0  # Number of surfaces uploaded so far
+
+    def get_size(self):
+        """Get logical screen size"""
+        return self.size
+
+    def get_texture(self, surface):
+        """Get the texture for a surface, uploading it the first time"""
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = Texture.from_surface(self.renderer, surface)
+            self.textures[surface] = texture
+            self.uploads += 1
+        return texture
+
+    def fill(self, color, rect=None):
+        """Fill the screen or part of it with a color
+
+        Frame contents are undefined after present(), so the first fill of a frame
+        always clears the whole screen.
+        """
+        self.renderer.draw_color = pygame.Color(color)
+        if rect is None or not self.cleared:
+            self.renderer.clear()
+            self.cleared = True
+            return pygame.Rect((0, 0), self.size)
+        rect = pygame.Rect(rect)
+        self.renderer.fill_rect(rect)
+        return rect
+
+    def blit(self, source, dest, area=None):
+        """Draw a surface with its top left corner at dest, returns the area drawn"""
+        position = dest.topleft if isinstance(dest, pygame.Rect) else dest
+        rect = pygame.Rect(position, area.size if area else source.get_size())
+        self.get_texture(source).draw(srcrect=area, dstrect=rect)
+        return rect
+
+    def blit_rotated(self, source, center, angle):
+        """Draw a surface rotated counterclockwise by angle degrees around center
+
+        Looks like blitting pygame.transform.rotate(source, angle) centered on
+        center, without making a new surface per angle. Returns the area drawn.
+        """
+        rect = source.get_rect(center=center)
+        self.get_texture(source).draw(dstrect=rect, angle=-angle)  # SDL rotates clockwise
+        return rect
+
+    def present(self):
+        """Show the frame that was drawn"""
+        self.renderer.present()
+        self.cleared = False
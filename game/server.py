@@ -0,0 +1,421 @@
+"""
+Authoritative multi-session game server
+
+Many players share one process: every session runs the regular game rules
+without a window, and a single asyncio clock ticks all of them at a fixed rate.
+Players connect over TCP, send one byte per press (the same as SPACE or a click)
+and get back compact deltas with only the fields that changed.
+
+Usage:
+    python -m game.server serve --port 8765
+    python -m game.server load --clients 300 --duration 30
+
+Protocol (all messages from the server start with a one byte length):
+    hello   session id, course seed, tick rate (HELLO)
+    delta   tick, changed field mask (DELTA_HEADER), then each changed field in
+            FIELDS order, then if SPAWNS_BIT is set a count and that many SPAWN
+            records for pipes spawned since the last delta
+Pipes move PIPE_SPEED to the left every tick, so clients can move them themselves.
+"""
+
+import argparse
+import asyncio
+import random
+import struct
+import time
+from collections import deque
+import pygame
+from .constants import (
+    SCREEN_HEIGHT, BIRD_START_X, BIRD_HEIGHT, PIPE_WIDTH, PIPE_SPEED,
+    SERVER_HOST, SERVER_PORT, SERVER_TICK_RATE, SERVER_MAX_SESSIONS, SERVER_MAX_CATCHUP_TICKS,
+    SERVER_MAX_QUEUED_PRESSES, SERVER_SEND_BUFFER_LIMIT, SERVER_METRICS_HISTORY,
+    SERVER_STATS_INTERVAL
+)
+from .core import GameCore
+from .latency import summarize
+from .quality import QualityGovernor, QUALITY_LEVELS
+from .game_state import PlayingState, GameOverState
+
+PRESS = b'\x01'  # Client to server: jump, start or restart depending on the screen
+
+MODE_MENU = 0
+MODE_PLAYING = 1
+MODE_GAME_OVER = 2
+
+LENGTH = struct.Struct('<B')
+HELLO = struct.Struct('<IIH')  # Session id, course seed, tick rate
+DELTA_HEADER = struct.Struct('<IB')  # Server tick, changed field mask
+COUNT = struct.Struct('<B')
+SPAWN = struct.Struct('<ihh?')  # Pipe pair x, gap y, gap size, has coin
+
+# Delta fields, bit i of the mask is set when FIELDS[i] follows
+FIELD_MODE = 0
+FIELD_BIRD_Y = 1
+FIELD_LIVES = 2
+FIELD_SCORE = 3
+FIELD_COINS = 4
+FIELD_INVINCIBLE = 5
+FIELD_PRESSES = 6  # Presses applied so far (wraps at 65536), lets clients time round trips
+FIELDS = (
+    struct.Struct('<B'),
+    struct.Struct('<h'),
+    struct.Struct('<B'),
+    struct.Struct('<I'),
+    struct.Struct('<H'),
+    struct.Struct('<?'),
+    struct.Struct('<H'),
+)
+SPAWNS_BIT = 1 << len(FIELDS)
+
+PRESS_EVENTS = ((pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE), 0.0),)
+
+
+def frame(payload):
+    """Prefix a message with its length"""
+    return LENGTH.pack(len(payload)) + payload
+
+
+async def read_message(reader):
+    """Read one length-prefixed message"""
+    length, = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+    return await reader.readexactly(length)
+
+
+def apply_delta(fields, payload):
+    """Update a client's list of field values from a delta, returns (tick, spawns)"""
+    tick, mask = DELTA_HEADER.unpack_from(payload)
+    offset = DELTA_HEADER.size
+    for i, field in enumerate(FIELDS):
+        if mask & (1 << i):
+            fields[i], = field.unpack_from(payload, offset)
+            offset += field.size
+    spawns = []
+    if mask & SPAWNS_BIT:
+        count, = COUNT.unpack_from(payload, offset)
+        offset += COUNT.size
+        for _ in range(count):
+            spawns.append(SPAWN.unpack_from(payload, offset))
+            offset += SPAWN.size
+    return tick, spawns
+
+
+def format_summary(name, summary):
+    """Format a summary as 'name mean/p95/max ms'"""
+    if summary['mean_ms'] is None:
+        return f"{name} -"
+    return f"{name} {summary['mean_ms']:.2f}/{summary['p95_ms']:.2f}/{summary['max_ms']:.2f}ms"
+
+
+class Session(GameCore):
+    """One remote player's game, running the normal rules without a window or audio
+
+    Every round replays the course of the session seed, so players given the same
+    seed compete on the same pipes and coins.
+    """
+
+    def __init__(self, session_id, seed):
+        quality = QualityGovernor(SERVER_TICK_RATE)
+        quality.set_level(len(QUALITY_LEVELS) - 1)  # Nothing is drawn, keep pipe images cheap
+        super().__init__(quality=quality)
+        self.session_id = session_id
+        self.seed = seed
+        self.course_seed = seed
+
+        self.pending_presses = 0
+        self.presses_applied = 0
+        self.spawned = []  # (pipe pair, has coin) spawned since the last delta
+        self.sent = None  # Field values in the last delta
+
+    def spawn_pipe_pair(self, index, frames_ahead=0):
+        """Spawn a course pipe pair and remember it for the next delta"""
+        super().spawn_pipe_pair(index, frames_ahead)
+        self.spawned.append((self.pipes[-1], self.course.coins[index]))
+
+    def press(self, count=1):
+        """Queue presses received from the player"""
+        self.pending_presses = min(self.pending_presses + count, SERVER_MAX_QUEUED_PRESSES)
+
+    def tick(self, frames=1):
+        """Apply at most one queued press and advance frames frames"""
+        events = ()
+        if self.pending_presses:
+            self.pending_presses -= 1
+            self.presses_applied += 1
+            events = PRESS_EVENTS
+        self.advance(frames, events)
+
+    def get_fields(self):
+        """Get current values of the delta fields"""
+        state = self.current_state
+        if isinstance(state, PlayingState):
+            mode, score = MODE_PLAYING, state.get_score()
+        elif isinstance(state, GameOverState):
+            mode, score = MODE_GAME_OVER, state.final_score
+        else:
+            mode, score = MODE_MENU, 0
+        return (mode, self.bird.rect.y, self.bird.lives, score,
+                self.coin_manager.get_collected_count(), self.bird.invincible,
+                self.presses_applied % 65536)
+
+    def encode_delta(self, tick):
+        """Get a delta message for everything that changed since the last one, or None"""
+        fields = self.get_fields()
+        mask = 0
+        parts = []
+        for i, field in enumerate(FIELDS):
+            if self.sent is None or fields[i] != self.sent[i]:
+                mask |= 1 << i
+                parts.append(field.pack(fields[i]))
+        if self.spawned:
+            mask |= SPAWNS_BIT
+            parts.append(COUNT.pack(len(self.spawned)))
+            for pipe_pair, has_coin in self.spawned:
+                parts.append(SPAWN.pack(pipe_pair.x, pipe_pair.gap_y, pipe_pair.gap, has_coin))
+            self.spawned.clear()
+        self.sent = fields
+
+        if not mask:
+            return None
+        return frame(DELTA_HEADER.pack(tick, mask) + b''.join(parts))
+
+
+class TickMetrics:
+    """Per-tick scheduling lag and simulation time of the server clock"""
+
+    def __init__(self, history=SERVER_METRICS_HISTORY):
+        self.lags = deque(maxlen=history)  # How late each tick started
+        self.work_times = deque(maxlen=history)  # Time spent ticking and encoding all sessions
+        self.ticks = 0
+        self.catch_up_ticks = 0  # Extra frames run because the clock was late
+        self.dropped_ticks = 0  # Frames skipped because the clock was too late to catch up
+        self.sessions = 0
+
+    def record(self, lag, work_time, frames, sessions):
+        """Record one run of the clock"""
+        self.lags.append(lag)
+        self.work_times.append(work_time)
+        self.ticks += frames
+        self.catch_up_ticks += frames - 1
+        self.sessions = sessions
+
+    def get_stats(self):
+        """Get tick counts and recent lag and work time in milliseconds"""
+        return {
+            'ticks': self.ticks,
+            'sessions': self.sessions,
+            'catch_up_ticks': self.catch_up_ticks,
+            'dropped_ticks': self.dropped_ticks,
+            'lag': summarize(self.lags),
+            'work': summarize(self.work_times),
+        }
+
+
+class GameServer:
+    """Hosts many sessions, all ticked by one fixed-rate clock"""
+
+    def __init__(self, tick_rate=SERVER_TICK_RATE, seed=None, max_sessions=SERVER_MAX_SESSIONS):
+        self.tick_rate = tick_rate
+        self.seed = seed  # Course seed for every session, a random one per session if None
+        self.max_sessions = max_sessions
+        self.connections = {}  # Session id -> (session, stream writer)
+        self.next_session_id = 1
+        self.tick = 0
+        self.metrics = TickMetrics()
+
+    async def handle_client(self, reader, writer):
+        """Serve one player until they disconnect"""
+        if len(self.connections) >= self.max_sessions:
+            writer.close()
+            return
+
+        seed = self.seed if self.seed is not None else random.getrandbits(32)
+        session = Session(self.next_session_id, seed)
+        self.next_session_id += 1
+        writer.write(frame(HELLO.pack(session.session_id, seed, self.tick_rate)))
+        self.connections[session.session_id] = (session, writer)
+        try:
+            while True:
+                data = await reader.read(1024)
+                if not data:
+                    break
+                session.press(data.count(PRESS))
+        except ConnectionError:
+            pass
+        finally:
+            del self.connections[session.session_id]
+            writer.close()
+
+    def step(self, frames=1):
+        """Tick every session and send their deltas"""
+        self.tick += frames
+        for session, writer in list(self.connections.values()):
+            session.tick(frames)
+            delta = session.encode_delta(self.tick)
+            if delta is None or writer.is_closing():
+                continue
+            if writer.transport.get_write_buffer_size() > SERVER_SEND_BUFFER_LIMIT:
+                writer.close()  # Client stopped reading, its reader loop ends the session
+                continue
+            writer.write(delta)
+
+    async def run_clock(self):
+        """Tick all sessions at tick_rate, catching up on late ticks with coarse steps"""
+        loop = asyncio.get_running_loop()
+        period = 1.0 / self.tick_rate
+        next_tick = loop.time()
+        while True:
+            # Always yield so connections are served even when ticks run late
+            await asyncio.sleep(max(next_tick - loop.time(), 0))
+            start = loop.time()
+            lag = max(start - next_tick, 0.0)
+            frames = 1 + int(lag / period)
+            if frames > SERVER_MAX_CATCHUP_TICKS:
+                self.metrics.dropped_ticks += frames - SERVER_MAX_CATCHUP_TICKS
+                frames = SERVER_MAX_CATCHUP_TICKS
+                next_tick = start + period  # Too far behind, start a new schedule
+            else:
+                next_tick += frames * period
+
+            self.step(frames)
+            self.metrics.record(lag, loop.time() - start, frames, len(self.connections))
+
+    async def report(self, interval=SERVER_STATS_INTERVAL):
+        """Print clock metrics every interval seconds"""
+        while True:
+            await asyncio.sleep(interval)
+            stats = self.metrics.get_stats()
+            print(f"tick {stats['ticks']} sessions {stats['sessions']} "
+                  f"{format_summary('lag', stats['lag'])} {format_summary('work', stats['work'])} "
+                  f"catch-up {stats['catch_up_ticks']} dropped {stats['dropped_ticks']}", flush=True)
+
+    async def serve(self, host=SERVER_HOST, port=SERVER_PORT):
+        """Accept players and run the clock until cancelled"""
+        server = await asyncio.start_server(self.handle_client, host, port,
+                                            backlog=min(self.max_sessions, 4096))
+        print(f"Serving on {host}:{port} at {self.tick_rate} ticks/s", flush=True)
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.run_clock(), self.report())
+
+
+class LoadStats:
+    """Measurements collected by all load-generator clients"""
+
+    def __init__(self):
+        self.round_trips = []  # Press sent until a delta shows it applied
+        self.intervals = []  # Time between consecutive deltas of one client
+        self.deltas = 0
+        self.bytes = 0
+        self.rounds = 0
+        self.best_score = 0
+
+
+async def run_bot(host, port, duration, stats):
+    """Connect one scripted player and play until duration runs out"""
+    loop = asyncio.get_running_loop()
+    reader, writer = await asyncio.open_connection(host, port)
+    await read_message(reader)  # Hello
+    fields = [0] * len(FIELDS)
+    pipes = []  # [x, gap center] of pipes not passed yet
+    in_flight = deque()  # Send times of presses not applied yet
+    applied = 0
+    last_tick = None
+    last_arrival = None
+    previous_y = None
+    try:
+        async with asyncio.timeout(duration):
+            while True:
+                payload = await read_message(reader)
+                now = loop.time()
+                mode = fields[FIELD_MODE]
+                tick, spawns = apply_delta(fields, payload)
+                stats.deltas += 1
+                stats.bytes += LENGTH.size + len(payload)
+                if last_arrival is not None:
+                    stats.intervals.append(now - last_arrival)
+                last_arrival = now
+
+                for _ in range(min((fields[FIELD_PRESSES] - applied) % 65536, len(in_flight))):
+                    stats.round_trips.append(now - in_flight.popleft())
+                applied = fields[FIELD_PRESSES]
+
+                # Track pipes locally, they all move at the same speed
+                if last_tick is not None:
+                    for pipe in pipes:
+                        pipe[0] -= PIPE_SPEED * (tick - last_tick)
+                last_tick = tick
+                if fields[FIELD_MODE] != mode:
+                    pipes.clear()
+                    if mode == MODE_PLAYING:
+                        stats.rounds += 1
+                        stats.best_score = max(stats.best_score, fields[FIELD_SCORE])
+                pipes.extend([x, gap_y + gap // 2] for x, gap_y, gap, _ in spawns)
+                pipes = [pipe for pipe in pipes if pipe[0] + PIPE_WIDTH >= BIRD_START_X]
+
+                # Flap when falling below the next gap, press through the menus
+                y = fields[FIELD_BIRD_Y]
+                if fields[FIELD_MODE] == MODE_PLAYING:
+                    target = pipes[0][1] if pipes else SCREEN_HEIGHT // 2
+                    press = (previous_y is not None and y >= previous_y
+                             and y + BIRD_HEIGHT // 2 > target + 20)
+                else:
+                    press = True
+                previous_y = y
+                if press and not in_flight:
+                    writer.write(PRESS)
+                    in_flight.append(loop.time())
+    except TimeoutError:
+        pass
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, clients, duration):
+    """Run many scripted players against a server and print what they measured"""
+    stats = LoadStats()
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run_bot(host, port, duration, stats) for _ in range(clients)),
+                                   return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    failed = [result for result in results if isinstance(result, Exception)]
+    print(f"clients {clients - len(failed)}/{clients} ({len(failed)} failed) in {elapsed:.1f}s")
+    if failed:
+        print(f"first failure: {failed[0]!r}")
+    if stats.deltas:
+        print(f"deltas {stats.deltas} ({stats.deltas / elapsed:.0f}/s), "
+              f"{stats.bytes / stats.deltas:.1f} bytes each")
+    print(format_summary('press round trip', summarize(stats.round_trips)))
+    print(format_summary('delta interval', summarize(stats.intervals)))
+    print(f"rounds {stats.rounds} best score {stats.best_score}")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help="host game sessions")
+    serve_parser.add_argument('--host', default=SERVER_HOST)
+    serve_parser.add_argument('--port', type=int, default=SERVER_PORT)
+    serve_parser.add_argument('--tick-rate', type=int, default=SERVER_TICK_RATE)
+    serve_parser.add_argument('--seed', type=int, default=None, help="same course for everyone")
+    serve_parser.add_argument('--max-sessions', type=int, default=SERVER_MAX_SESSIONS)
+
+    load_parser = commands.add_parser('load', help="connect scripted players to a server")
+    load_parser.add_argument('--host', default=SERVER_HOST)
+    load_parser.add_argument('--port', type=int, default=SERVER_PORT)
+    load_parser.add_argument('--clients', type=int, default=100)
+    load_parser.add_argument('--duration', type=float, default=30.0, help="seconds")
+
+    args = parser.parse_args()
+    try:
+        if args.command == 'serve':
+            server = GameServer(args.tick_rate, args.seed, args.max_sessions)
+            asyncio.run(server.serve(args.host, args.port))
+        else:
+            asyncio.run(run_load(args.host, args.port, args.clients, args.duration))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Compact play state snapshots and a rewind ring buffer
+
+A snapshot holds everything needed to resume play (bird, pipes, coins, score,
+and the course seed and how far along it the round is) packed into a fixed-size binary
+record. Surfaces are never stored; restoring reuses the existing pipe and coin
+objects where it can.
+"""
+
+import struct
+from .constants import SNAPSHOT_HISTORY, SNAPSHOT_MAX_PIPES
+from .pipes import PipePair
+from .coins import Coin
+from .course import Course
+from .game_state import PlayingState
+
+# Bird x, y, velocity, lives, alive, invincible, invincible timer,
+# score, coins collected, course seed, round frames, next course pipe, pipe count, coin count
+HEADER = struct.Struct('<hhdB??hiIIIIHH')
+# Pipe pair x, gap y, gap size, flags
+PIPE = struct.Struct('<ihhB')
+# Coin center x, center y, rotation angle
+COIN = struct.Struct('<ihH')
+
+PIPE_PASSED = 1
+PIPE_HIT = 2
+
+PIPES_OFFSET = HEADER.size
+COINS_OFFSET = PIPES_OFFSET + PIPE.size * SNAPSHOT_MAX_PIPES
+RECORD_SIZE = COINS_OFFSET + COIN.size * SNAPSHOT_MAX_PIPES
+
+
+def pack_into(game, buffer, offset=0):
+    """Write a snapshot of a game in PlayingState into buffer at offset"""
+    state = game.current_state
+    bird = game.bird
+    coins = game.coin_manager.coins.sprites()
+    if len(game.pipes) > SNAPSHOT_MAX_PIPES or len(coins) > SNAPSHOT_MAX_PIPES:
+        raise ValueError(f"Snapshot has room for {SNAPSHOT_MAX_PIPES} pipes and coins")
+
+    HEADER.pack_into(
+        buffer, offset, bird.rect.x, bird.rect.y, bird.velocity, bird.lives, bird.alive,
+        bird.invincible, bird.invincible_timer, state.score,
+        game.coin_manager.collected_count, game.course.seed, game.round_frames, game.next_pipe,
+        len(game.pipes), len(coins)
+    )
+
+    position = offset + PIPES_OFFSET
+    for pipe_pair in game.pipes:
+        flags = PIPE_PASSED if pipe_pair.passed else 0
+        if id(pipe_pair) in state.hit_pipe_pairs:
+            flags |= PIPE_HIT
+        PIPE.pack_into(buffer, position, pipe_pair.x, pipe_pair.gap_y, pipe_pair.gap, flags)
+        position += PIPE.size
+
+    position = offset + COINS_OFFSET
+    for coin in coins:
+        COIN.pack_into(buffer, position, coin.rect.centerx, coin.rect.centery, coin.rotation_angle)
+        position += COIN.size
+
+
+def snapshot(game):
+    """Get a snapshot of a game as bytes"""
+    record = bytearray(RECORD_SIZE)
+    pack_into(game, record)
+    return bytes(record)
+
+
+def unpack_from(game, buffer, offset=0):
+    """Restore a game to the snapshot in buffer at offset"""
+    (bird_x, bird_y, velocity, lives, alive, invincible, invincible_timer, score,
+     collected_count, course_seed, round_frames, next_pipe, pipe_count,
+     coin_count) = HEADER.unpack_from(buffer, offset)
+
+    bird = game.bird
+    bird.rect.x = bird_x
+    bird.rect.y = bird_y
+    bird.velocity = velocity
+    bird.lives = lives
+    bird.alive = alive
+    bird.invincible = invincible
+    bird.invincible_timer = invincible_timer
+
+    # Snapshots are only restored into games playing the same difficulty curve
+    if game.course is None or game.course.seed != course_seed:
+        game.course = Course(course_seed, game.difficulty)
+    game.round_frames = round_frames
+    game.next_pipe = next_pipe
+    game.coin_manager.collected_count = collected_count
+    if not isinstance(game.current_state, PlayingState):
+        game.current_state = PlayingState(bird, game.pipes, game.coin_manager, game.audio, game.quality)
+    state = game.current_state
+    state.reset_next_state()  # A game over queued on the frame rewound from no longer happened
+    state.score = score
+
+    # Reuse pipe pairs with the same gap, their images only depend on it
+    spare = {}
+    for pipe_pair in game.pipes:
+        spare.setdefault((pipe_pair.gap_y, pipe_pair.gap), []).append(pipe_pair)
+    pipes = []
+    state.hit_pipe_pairs.clear()
+    bands = game.quality.get_setting('pipe_bands')
+    for i in range(pipe_count):
+        x, gap_y, gap, flags = PIPE.unpack_from(buffer, offset + PIPES_OFFSET + i * PIPE.size)
+        matches = spare.get((gap_y, gap))
+        if matches:
+            pipe_pair = matches.pop()
+            pipe_pair.move_to(x)
+        else:
+            pipe_pair = PipePair(x, bands=bands, gap_y=gap_y, gap=gap)
+        pipe_pair.passed = bool(flags & PIPE_PASSED)
+        if flags & PIPE_HIT:
+            state.hit_pipe_pairs.add(id(pipe_pair))
+        pipes.append(pipe_pair)
+    game.pipes[:] = pipes  # PlayingState shares this list
+
+    coin_manager = game.coin_manager
+    spare_coins = coin_manager.coins.sprites()
+    coin_manager.coins.empty()
+    for i in range(coin_count):
+        center_x, center_y, angle = COIN.unpack_from(buffer, offset + COINS_OFFSET + i * COIN.size)
+        coin = spare_coins.pop() if spare_coins else Coin(center_x, center_y)
+        coin.collected = False
+        coin.set_angle(angle, coin_manager.rotation_step, (center_x, center_y))
+        coin_manager.coins.add(coin)
+
+
+def restore(game, record):
+    """Restore a game to a snapshot made by snapshot()"""
+    unpack_from(game, record)
+
+
+class SnapshotRing:
+    """Preallocated ring buffer of recent snapshots"""
+
+    def __init__(self, capacity=SNAPSHOT_HISTORY):
+        self.capacity = capacity
+        self.buffer = bytearray(RECORD_SIZE * capacity)
+        self.view = memoryview(self.buffer)
+        self.next = 0  # Slot the next snapshot goes into
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, game):
+        """Record the current state, overwriting the oldest when full"""
+        pack_into(game, self.buffer, self.next * RECORD_SIZE)
+        self.next = (self.next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def get(self, frames_back=0):
+        """Get the record frames_back snapshots before the newest"""
+        if not 0 <= frames_back < self.count:
+            raise IndexError("Snapshot not in history")
+        slot = (self.next - 1 - frames_back) % self.capacity
+        return self.view[slot * RECORD_SIZE:(slot + 1) * RECORD_SIZE]
+
+    def rewind(self, game, frames=1):
+        """Restore the state from frames snapshots ago and drop everything newer
+
+        With frames=0 the newest snapshot is restored and kept.
+        """
+        frames = min(frames, self.count - 1)
+        unpack_from(game, self.get(frames))
+        self.next = (self.next - frames) % self.capacity
+        self.count -= frames
+
+    def clear(self):
+        """Forget all snapshots"""
+        self.next = 0
+        self.count = 0
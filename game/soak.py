@@ -0,0 +1,244 @@
+"""
+Long-session soak test looking for memory and object leaks
+
+Runs the game headless for hours of simulated frames with a scripted player
+that keeps going menu -> playing -> game over -> menu. Every time the game is
+back at the menu it records traced memory, process RSS, live sprite, surface,
+font and state counts and the largest PlayingState.hit_pipe_pairs of the
+round, then flags anything that keeps growing.
+
+Usage:
+    python -m game.soak --hours 2 --seed 0
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+import pygame
+from .constants import (
+    FPS, PIPE_WIDTH, SCREEN_HEIGHT, SOAK_HOURS, SOAK_MAX_ROUND_FRAMES, SOAK_WARMUP_ROUNDS,
+    SOAK_GROWTH_TOLERANCE, SOAK_TOP_ALLOCATIONS
+)
+from .main import Game
+from .latency import stamp_events
+from .game_state import GameState, MenuState, PlayingState
+
+# Exit statuses: nothing grew, something grew, too few rounds to tell
+CLEAN, GROWING, INCONCLUSIVE = 0, 1, 2
+
+# Metrics checked for growth, with the smallest growth worth flagging. Peaks
+# within a round also depend on how long the round lasted, so allow more there.
+METRICS = {
+    'traced_kb': 256,
+    'rss_kb': 4096,
+    'sprites': 1,
+    'surfaces': 1,
+    'fonts': 1,
+    'states': 1,
+    'hit_pipe_pairs': 2,
+    'peak_pipes': 5,
+}
+
+
+def get_rss_kb():
+    """Get resident memory of this process in KiB, None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+
+
+def count_live_objects():
+    """Count live sprites, game states, and surfaces and fonts held by Python objects
+
+    Surfaces and fonts are not tracked by the garbage collector, so they are
+    found through the objects referring to them.
+    """
+    gc.collect()
+    counts = {'sprites': 0, 'surfaces': 0, 'fonts': 0, 'states': 0}
+    seen = set()
+    for obj in gc.get_objects():
+        if isinstance(obj, pygame.sprite.Sprite):
+            counts['sprites'] += 1
+        elif isinstance(obj, GameState):
+            counts['states'] += 1
+        for referent in gc.get_referents(obj):
+            if id(referent) in seen:
+                continue
+            if isinstance(referent, pygame.Surface):
+                counts['surfaces'] += 1
+            elif isinstance(referent, pygame.font.Font):
+                counts['fonts'] += 1
+            else:
+                continue
+            seen.add(id(referent))
+    return counts
+
+
+class ScriptedPlayer:
+    """Plays rounds of random length and presses through the menus like a visitor"""
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        self.jump = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)
+        self.wait = 0  # Frames left before pressing on a menu screen
+        self.round_frames = 0
+        self.round_limit = 0  # Frames after which the player stops flapping
+
+    def get_events(self, game):
+        """Get the events to send this frame"""
+        if isinstance(game.current_state, PlayingState):
+            self.round_frames += 1
+            if self.round_frames < self.round_limit and self.should_flap(game):
+                return [self.jump]
+            return []
+
+        if self.wait > 0:
+            self.wait -= 1
+            return []
+        self.wait = self.rng.randint(FPS // 2, FPS * 3)
+        self.round_frames = 0
+        self.round_limit = self.rng.randint(SOAK_MAX_ROUND_FRAMES // 10, SOAK_MAX_ROUND_FRAMES)
+        return [self.jump]
+
+    def should_flap(self, game):
+        """Flap when falling below the middle of the next gap"""
+        bird = game.bird
+        target = SCREEN_HEIGHT // 2
+        for pipe_pair in game.pipes:
+            if pipe_pair.x + PIPE_WIDTH >= bird.rect.x:
+                target = pipe_pair.get_gap_center()
+                break
+        return bird.velocity >= 0 and bird.rect.centery > target + 15
+
+
+class SoakTest:
+    """Runs the game for a long time and looks for growth between rounds"""
+
+    def __init__(self, hours=SOAK_HOURS, seed=0):
+        self.frames = int(hours * 3600 * FPS)
+        self.seed = seed
+        self.samples = []  # One per return to the menu
+        self.top_growth = []  # tracemalloc statistics growing the most after warm-up
+        self.elapsed = 0.0
+
+    def take_sample(self, frame, peak_hits, peak_pipes):
+        """Record memory and object counts, returns the tracemalloc snapshot"""
+        counts = count_live_objects()
+        # Leave out what the harness itself allocates
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ))
+        traced = sum(stat.size for stat in snapshot.statistics('filename'))
+        sample = {'frame': frame, 'traced_kb': traced // 1024, 'rss_kb': get_rss_kb(),
+                  'hit_pipe_pairs': peak_hits, 'peak_pipes': peak_pipes}
+        sample.update(counts)
+        self.samples.append(sample)
+        return snapshot
+
+    def run(self, progress=True):
+        """Play all frames, sampling each time the game gets back to the menu"""
+        game = Game(headless=True)
+        random.seed(self.seed)
+        player = ScriptedPlayer(self.seed)
+        start = time.perf_counter()
+        tracemalloc.start()
+        self.take_sample(0, 0, 0)
+        baseline = latest = None
+        peak_hits = peak_pipes = 0
+
+        for frame in range(1, self.frames + 1):
+            back_to_menu = not isinstance(game.current_state, MenuState)
+            game.step(stamp_events(player.get_events(game)))
+            game.present()
+            game.input_latency.mark_flip()
+
+            state = game.current_state
+            if isinstance(state, PlayingState):
+                peak_hits = max(peak_hits, len(state.hit_pipe_pairs))
+                peak_pipes = max(peak_pipes, len(game.pipes))
+            elif back_to_menu and isinstance(state, MenuState):
+                snapshot = self.take_sample(frame, peak_hits, peak_pipes)
+                peak_hits = peak_pipes = 0
+                if len(self.samples) == SOAK_WARMUP_ROUNDS + 1:
+                    baseline = snapshot
+                latest = snapshot
+                if progress and len(self.samples) % 50 == 0:
+                    print(f"round {len(self.samples) - 1}, frame {frame}/{self.frames}, "
+                          f"traced {self.samples[-1]['traced_kb']}KiB", flush=True)
+
+        if baseline is not None and baseline is not latest:
+            self.top_growth = latest.compare_to(baseline, 'lineno')[:SOAK_TOP_ALLOCATIONS]
+        tracemalloc.stop()
+        self.elapsed = time.perf_counter() - start
+
+    def find_trends(self):
+        """Compare the start and end of the run for every metric
+
+        Returns (metric, start, end, growth per simulated hour, flagged) tuples,
+        where start and end are medians of the first and last quarter of rounds
+        after warm-up, so round-to-round noise does not count as growth.
+        """
+        samples = self.samples[SOAK_WARMUP_ROUNDS + 1:]
+        quarter = max(1, len(samples) // 4)
+        trends = []
+        for metric, min_growth in METRICS.items():
+            values = [sample[metric] for sample in samples if sample[metric] is not None]
+            if len(values) < 4:
+                continue
+            first = sorted(values[:quarter])[len(values[:quarter]) // 2]
+            last = sorted(values[-quarter:])[len(values[-quarter:]) // 2]
+
+            # Least squares slope over frames
+            frames = [sample['frame'] for sample in samples if sample[metric] is not None]
+            mean_frame = sum(frames) / len(frames)
+            mean_value = sum(values) / len(values)
+            spread = sum((f - mean_frame) ** 2 for f in frames)
+            slope = sum((f - mean_frame) * (v - mean_value) for f, v in zip(frames, values)) / spread if spread else 0.0
+
+            flagged = last - first >= min_growth and last > first * (1 + SOAK_GROWTH_TOLERANCE)
+            trends.append((metric, first, last, slope * 3600 * FPS, flagged))
+        return trends
+
+    def print_report(self):
+        """Print trends and the source lines whose memory grew the most, returns the exit status"""
+        rounds = len(self.samples) - 1
+        print(f"{self.frames} frames ({self.frames / FPS / 3600:.2f}h simulated), {rounds} rounds "
+              f"in {self.elapsed:.0f}s")
+        if rounds <= SOAK_WARMUP_ROUNDS + 4:
+            print("Not enough rounds to look for trends, run longer")
+            return INCONCLUSIVE
+
+        trends = self.find_trends()
+        print(f"{'metric':<16}{'start':>10}{'end':>10}{'per hour':>12}")
+        for metric, first, last, per_hour, flagged in trends:
+            print(f"{metric:<16}{first:>10}{last:>10}{per_hour:>12.1f}{'  GROWING' if flagged else ''}")
+
+        if self.top_growth:
+            print("Largest memory growth after warm-up:")
+            for stat in self.top_growth:
+                print(f"  {stat}")
+        return GROWING if any(flagged for *_, flagged in trends) else CLEAN
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--hours', type=float, default=SOAK_HOURS, help="simulated play time")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    test = SoakTest(args.hours, args.seed)
+    test.run()
+    sys.exit(test.print_report())
+
+
+if __name__ == "__main__":
+    main()
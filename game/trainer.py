@@ -0,0 +1,449 @@
+"""
+Neuroevolution trainer for bot players
+
+Small policy networks (bird y, velocity and next gap -> jump or not) are evolved
+in pure NumPy. Whole populations are simulated at once on seeded courses that
+follow the same pipe and coin rules as the game, and chunks of the population
+are spread over worker processes, which can share courses precomputed into a
+file by python -m game.course save.
+
+Usage:
+    python -m game.trainer train --generations 1000 --workers 8
+    python -m game.trainer train --course-file courses.npz
+    python -m game.trainer play checkpoints/population.npz
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pygame
+from .constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, BIRD_WIDTH, BIRD_HEIGHT, BIRD_START_X, BIRD_START_Y,
+    GRAVITY, JUMP_STRENGTH, BIRD_MAX_VELOCITY, INITIAL_LIVES, PIPE_WIDTH, PIPE_SPEED,
+    COIN_SIZE, COIN_ROTATION_SPEED, COIN_SCORE, SCORE_INCREMENT,
+    TRAIN_POPULATION, TRAIN_HIDDEN_SIZE, TRAIN_COURSES, TRAIN_MAX_FRAMES,
+    TRAIN_ELITE_COUNT, TRAIN_PARENT_FRACTION, TRAIN_MUTATION_STD, TRAIN_CHECKPOINT_EVERY
+)
+from .course import Course, SPAWN_EDGE, load_courses
+
+INPUT_SIZE = 4  # Bird y, bird velocity, next gap center y, distance to next pipe
+PIPE_CAP_HEIGHT = 20  # Pipe caps extend the collision rect into the gap
+INVINCIBLE_DURATION = 120  # Same as Bird.INVINCIBLE_DURATION
+SURVIVAL_WEIGHT = 0.01  # Fitness per frame survived, on top of the game score
+
+
+def genome_size(hidden=TRAIN_HIDDEN_SIZE):
+    """Get number of weights in one policy network"""
+    return INPUT_SIZE * hidden + hidden + hidden + 1
+
+
+def policy(genomes, features, hidden=TRAIN_HIDDEN_SIZE):
+    """Evaluate many networks at once, returns True where the bird should jump
+
+    genomes is (..., genome_size) and features is (..., INPUT_SIZE).
+    """
+    n = INPUT_SIZE * hidden
+    w1 = genomes[..., :n].reshape(genomes.shape[:-1] + (INPUT_SIZE, hidden))
+    b1 = genomes[..., n:n + hidden]
+    w2 = genomes[..., n + hidden:n + 2 * hidden]
+    b2 = genomes[..., -1]
+    h = np.tanh(np.einsum('...i,...ih->...h', features, w1) + b1)
+    return np.einsum('...h,...h->...', h, w2) + b2 > 0
+
+
+def make_features(bird_y, velocity, gap_center, distance):
+    """Normalize policy inputs to roughly [-1, 1]"""
+    return np.stack(np.broadcast_arrays(
+        bird_y / SCREEN_HEIGHT, velocity / BIRD_MAX_VELOCITY,
+        gap_center / SCREEN_HEIGHT, distance / SCREEN_WIDTH
+    ), axis=-1)
+
+
+def coin_sizes():
+    """Get rotated coin image size for every angle a coin can show"""
+    base = pygame.Surface((COIN_SIZE, COIN_SIZE), pygame.SRCALPHA)
+    angles = range(0, 360, COIN_ROTATION_SPEED)
+    return np.array([pygame.transform.rotate(base, a).get_size() for a in angles])
+
+
+class CourseTables:
+    """Pipes and coins of a course.Course, as per-frame lookup tables
+
+    Pipes spawn and move the same way as in the game, so a game with
+    course_seed set to the course seed plays the same course.
+    """
+
+    def __init__(self, course, max_frames=TRAIN_MAX_FRAMES):
+        # Pipe pairs spawned within max_frames, each on the first frame it is
+        # within SPAWN_EDGE of the left of the screen (see Game.spawn_pipes)
+        count = max(1, course.generate_to(SPAWN_EDGE + PIPE_SPEED * max_frames))
+        position = np.array(course.positions[:count])
+        gap_y = np.array(course.gap_ys[:count])
+        gap = np.array(course.gaps[:count])
+        has_coin = np.array(course.coins[:count])
+        spawn = np.maximum(1, -(-(position - SPAWN_EDGE) // PIPE_SPEED))
+        frames = np.arange(max_frames + 1)[:, None]
+        moves = frames - spawn + 1  # Pipes move once on the frame they spawn
+        present = moves > 0
+        x = np.where(present, position - PIPE_SPEED * frames, np.inf)
+        gap_center = gap_y + gap // 2
+
+        # Next pipe the bird has not passed yet (state after each frame)
+        ahead = present & (x + PIPE_WIDTH >= BIRD_START_X)
+        has_next = ahead.any(axis=1)
+        next_pipe = ahead.argmax(axis=1)
+        self.next_gap = np.where(has_next, gap_center[next_pipe], SCREEN_HEIGHT / 2)
+        self.next_distance = np.where(has_next, x[frames[:, 0], next_pipe] - BIRD_START_X,
+                                      SCREEN_WIDTH)
+
+        # Part of each frame in which the bird overlaps a pipe horizontally (collisions are
+        # swept like PlayingState.update: relative to the pipes the bird moves PIPE_SPEED right)
+        rows = frames[:, 0]
+        enter, leave = horizontal_window(x, PIPE_WIDTH)
+        overlap = present & (enter < leave)
+        pipe = overlap.argmax(axis=1)
+        hit_any = overlap.any(axis=1)
+        self.pipe_enter = np.where(hit_any, enter[rows, pipe], 1.0)
+        self.pipe_leave = np.where(hit_any, leave[rows, pipe], 0.0)
+        self.gap_top = gap_y[pipe] + PIPE_CAP_HEIGHT
+        self.gap_bottom = gap_y[pipe] + gap[pipe] - PIPE_CAP_HEIGHT
+
+        # Pipes passed on each frame
+        passed_now = present & (x + PIPE_WIDTH < BIRD_START_X)
+        passed_before = present & (x + PIPE_SPEED + PIPE_WIDTH < BIRD_START_X) & (moves > 1)
+        self.passed = (passed_now & ~passed_before).sum(axis=1)
+
+        # Same for coins; rotated coins change size every frame
+        sizes = coin_sizes()
+        angle_index = np.where(present, moves % len(sizes), 0)
+        width = sizes[angle_index, 0]
+        height = sizes[angle_index, 1]
+        center_x = np.where(present, x + PIPE_WIDTH // 2, 0)
+        enter, leave = horizontal_window(center_x - width // 2, width)
+        coin_overlap = present & has_coin & (enter < leave)
+        coin = coin_overlap.argmax(axis=1)
+        has_coin_now = coin_overlap.any(axis=1)
+        self.coin = np.where(has_coin_now, coin, -1)
+        self.coin_enter = np.where(has_coin_now, enter[rows, coin], 1.0)
+        self.coin_leave = np.where(has_coin_now, leave[rows, coin], 0.0)
+        self.coin_top = gap_center[coin] - height[rows, coin] // 2
+        self.coin_bottom = self.coin_top + height[rows, coin]
+        self.max_frames = max_frames
+
+
+def horizontal_window(left, width):
+    """Get the part of a frame [enter, leave) in which the bird overlaps spans horizontally
+
+    Same arithmetic as collision.sweep, for the bird moving PIPE_SPEED right.
+    """
+    start = BIRD_START_X - PIPE_SPEED
+    with np.errstate(invalid='ignore'):
+        enter = (left - (start + BIRD_WIDTH)) / PIPE_SPEED
+        leave = (left + width - start) / PIPE_SPEED
+    return np.maximum(enter, 0.0), np.minimum(leave, 1.0)
+
+
+def swept_hit(enter, leave, y_previous, dy, top, bottom):
+    """Check if the bird moving dy from y_previous overlaps [top, bottom) within [enter, leave)
+
+    Same arithmetic as collision.sweep.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        enter_y = (top - (y_previous + BIRD_HEIGHT)) / dy
+        leave_y = (bottom - y_previous) / dy
+    enter_y, leave_y = np.where(dy > 0, enter_y, leave_y), np.where(dy > 0, leave_y, enter_y)
+    static = (y_previous < bottom) & (top < y_previous + BIRD_HEIGHT)
+    enter_y = np.where(dy == 0, np.where(static, -np.inf, np.inf), enter_y)
+    leave_y = np.where(dy == 0, np.where(static, np.inf, -np.inf), leave_y)
+    return np.maximum(enter, enter_y) < np.minimum(leave, leave_y)
+
+
+def simulate(genomes, courses, hidden=TRAIN_HIDDEN_SIZE):
+    """Play every genome on every course at once
+
+    Returns (score, frames survived), each shaped (courses, genomes).
+    """
+    shape = (len(courses), len(genomes))
+    max_frames = min(course.max_frames for course in courses)
+    tables = {name: np.stack([getattr(course, name) for course in courses])[:, :, None]
+              for name in ('next_gap', 'next_distance', 'pipe_enter', 'pipe_leave', 'gap_top',
+                           'gap_bottom', 'passed', 'coin', 'coin_enter', 'coin_leave', 'coin_top',
+                           'coin_bottom')}
+
+    y = np.full(shape, float(BIRD_START_Y))
+    velocity = np.zeros(shape)
+    lives = np.full(shape, INITIAL_LIVES)
+    alive = np.ones(shape, dtype=bool)
+    invincible = np.zeros(shape, dtype=bool)
+    invincible_timer = np.zeros(shape, dtype=int)
+    score = np.zeros(shape, dtype=int)
+    frames = np.zeros(shape, dtype=int)
+    last_coin = np.full(shape, -1)  # Coins come one at a time, so remember the last one taken
+
+    for t in range(1, max_frames + 1):
+        if not alive.any():
+            break
+
+        # Input is read before the frame is updated (Game.step order)
+        features = make_features(y, velocity, tables['next_gap'][:, t - 1],
+                                 tables['next_distance'][:, t - 1])
+        jump = alive & policy(genomes, features, hidden)
+        velocity[jump] = JUMP_STRENGTH
+
+        # Bird.update
+        y_previous = y.copy()
+        invincible_timer[invincible] -= 1
+        invincible &= invincible_timer > 0
+        velocity[alive] = np.minimum(velocity[alive] + GRAVITY, BIRD_MAX_VELOCITY)
+        y[alive] = np.floor(y[alive] + velocity[alive] + 0.5)  # Rect rounds assigned floats
+        top = alive & (y < 0)
+        y[top] = 0
+        velocity[top] = 0
+        bottom = alive & (y + BIRD_HEIGHT > SCREEN_HEIGHT)
+        y[bottom] = SCREEN_HEIGHT - BIRD_HEIGHT
+        velocity[bottom] = 0
+        score += np.where(alive, tables['passed'][:, t] * SCORE_INCREMENT, 0)
+        frames += alive
+
+        # PlayingState.update: pipes, then coins, then screen edges
+        checked = alive & ~invincible
+        dy = y - y_previous
+        enter, leave = tables['pipe_enter'][:, t], tables['pipe_leave'][:, t]
+        hit = checked & (swept_hit(enter, leave, y_previous, dy, 0, tables['gap_top'][:, t])
+                         | swept_hit(enter, leave, y_previous, dy, tables['gap_bottom'][:, t], SCREEN_HEIGHT))
+        checked &= ~hit
+        coin = tables['coin'][:, t]
+        got = checked & (last_coin != coin) & swept_hit(
+            tables['coin_enter'][:, t], tables['coin_leave'][:, t], y_previous, dy,
+            tables['coin_top'][:, t], tables['coin_bottom'][:, t]
+        )
+        last_coin = np.where(got, coin, last_coin)
+        score += got * COIN_SCORE
+        hit |= checked & ((y <= 0) | (y + BIRD_HEIGHT >= SCREEN_HEIGHT))
+
+        # Bird.lose_life
+        lives -= hit
+        died = hit & (lives <= 0)
+        alive &= ~died
+        respawn = hit & ~died
+        y[respawn] = BIRD_START_Y
+        velocity[respawn] = 0
+        invincible |= respawn
+        invincible_timer[respawn] = INVINCIBLE_DURATION
+
+    return score, frames
+
+
+def fitness(score, frames):
+    """Get mean fitness over courses for each genome"""
+    return (score + frames * SURVIVAL_WEIGHT).mean(axis=0)
+
+
+# Courses built once per worker process
+_worker_courses = None
+_worker_hidden = TRAIN_HIDDEN_SIZE
+
+
+def make_tables(seeds, max_frames, course_file=None):
+    """Build lookup tables for the courses of seeds, taken from a course file where it has them"""
+    saved = load_courses(course_file) if course_file else {}
+    return [CourseTables(saved[seed] if seed in saved else Course(seed), max_frames) for seed in seeds]
+
+
+def _init_worker(seeds, max_frames, hidden, course_file):
+    """Build the evaluation courses in a worker process"""
+    global _worker_courses, _worker_hidden
+    _worker_courses = make_tables(seeds, max_frames, course_file)
+    _worker_hidden = hidden
+
+
+def _evaluate_chunk(genomes):
+    """Get fitness of a chunk of the population in a worker process"""
+    return fitness(*simulate(genomes, _worker_courses, _worker_hidden))
+
+
+class Trainer:
+    """Evolves a population of policy networks"""
+
+    def __init__(self, population=TRAIN_POPULATION, hidden=TRAIN_HIDDEN_SIZE, courses=TRAIN_COURSES,
+                 max_frames=TRAIN_MAX_FRAMES, seed=0, workers=None, course_file=None):
+        self.hidden = hidden
+        self.max_frames = max_frames
+        # Courses come from the course file when there is one
+        self.course_file = course_file
+        if course_file:
+            self.course_seeds = list(load_courses(course_file))[:courses]
+        else:
+            self.course_seeds = [seed + i for i in range(courses)]
+        self.rng = np.random.default_rng(seed)
+        self.population = self.rng.normal(0.0, 1.0, (population, genome_size(hidden)))
+        self.fitness = np.zeros(population)
+        self.generation = 0
+        self.workers = workers or os.cpu_count() or 1
+        self.courses = None
+        self.executor = None
+
+    def evaluate(self):
+        """Compute fitness of the whole population"""
+        if self.workers <= 1:
+            if self.courses is None:
+                self.courses = make_tables(self.course_seeds, self.max_frames, self.course_file)
+            self.fitness = fitness(*simulate(self.population, self.courses, self.hidden))
+            return self.fitness
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                self.workers, initializer=_init_worker,
+                initargs=(self.course_seeds, self.max_frames, self.hidden, self.course_file)
+            )
+        chunks = np.array_split(self.population, self.workers)
+        self.fitness = np.concatenate(list(self.executor.map(_evaluate_chunk, chunks)))
+        return self.fitness
+
+    def next_generation(self):
+        """Replace the population with children of its best genomes"""
+        order = np.argsort(-self.fitness)
+        size, n = self.population.shape
+        parents = self.population[order[:max(2, int(size * TRAIN_PARENT_FRACTION))]]
+
+        children = np.empty_like(self.population)
+        children[:TRAIN_ELITE_COUNT] = self.population[order[:TRAIN_ELITE_COUNT]]
+        count = size - TRAIN_ELITE_COUNT
+        mothers = parents[self.rng.integers(len(parents), size=count)]
+        fathers = parents[self.rng.integers(len(parents), size=count)]
+        # Uniform crossover, then gaussian mutation
+        mask = self.rng.random((count, n)) < 0.5
+        children[TRAIN_ELITE_COUNT:] = np.where(mask, mothers, fathers)
+        children[TRAIN_ELITE_COUNT:] += self.rng.normal(0.0, TRAIN_MUTATION_STD, (count, n))
+
+        self.population = children
+        self.generation += 1
+
+    def get_best(self):
+        """Get best genome of the last evaluation and its fitness"""
+        best = int(np.argmax(self.fitness))
+        return self.population[best], self.fitness[best]
+
+    def train(self, generations, checkpoint_path=None, log=print):
+        """Run generations of evaluation and selection"""
+        for _ in range(generations):
+            start = time.perf_counter()
+            self.evaluate()
+            best, best_fitness = self.get_best()
+            log(f"Generation {self.generation}: best {best_fitness:.2f}, "
+                f"mean {self.fitness.mean():.2f} ({time.perf_counter() - start:.2f}s)")
+            if checkpoint_path and self.generation % TRAIN_CHECKPOINT_EVERY == 0:
+                self.save(checkpoint_path)
+            self.next_generation()
+        if checkpoint_path:
+            self.evaluate()
+            self.save(checkpoint_path)
+
+    def close(self):
+        """Shut down worker processes"""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def save(self, path):
+        """Write population, fitness and RNG state to a .npz checkpoint"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez(path, population=self.population, fitness=self.fitness,
+                 generation=self.generation, hidden=self.hidden, max_frames=self.max_frames,
+                 course_seeds=self.course_seeds,
+                 rng_state=json.dumps(self.rng.bit_generator.state))
+
+    @classmethod
+    def load(cls, path, workers=None, course_file=None):
+        """Resume training from a checkpoint"""
+        data = np.load(path)
+        trainer = cls(population=len(data['population']), hidden=int(data['hidden']),
+                      courses=len(data['course_seeds']), max_frames=int(data['max_frames']),
+                      workers=workers, course_file=course_file)
+        trainer.course_seeds = [int(seed) for seed in data['course_seeds']]
+        trainer.population = data['population']
+        trainer.fitness = data['fitness']
+        trainer.generation = int(data['generation'])
+        trainer.rng.bit_generator.state = json.loads(str(data['rng_state']))
+        return trainer
+
+
+def game_features(game):
+    """Get policy inputs from a running Game"""
+    bird = game.bird
+    gap_center = SCREEN_HEIGHT / 2
+    distance = SCREEN_WIDTH
+    for pipe_pair in game.pipes:
+        if pipe_pair.x + PIPE_WIDTH >= bird.rect.x:
+            gap_center = pipe_pair.get_gap_center()
+            distance = pipe_pair.x - bird.rect.x
+            break
+    return make_features(np.float64(bird.rect.y), bird.velocity, gap_center, distance)
+
+
+def play(genome, seed=0, hidden=TRAIN_HIDDEN_SIZE):
+    """Let a genome play in the real game window"""
+    from .main import Game
+    from .game_state import PlayingState
+    from .latency import poll_events, stamp_events
+
+    game = Game()
+    jump = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)
+    game.course_seed = seed
+    game.current_state.next_state = 'playing'
+    while game.running:
+        events = poll_events()
+        if isinstance(game.current_state, PlayingState) and policy(genome, game_features(game), hidden):
+            events += stamp_events([jump])
+        game.step(events)
+        game.present()
+        game.clock.tick(FPS)
+    pygame.quit()
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = commands.add_parser('train', help="evolve a population")
+    train_parser.add_argument('--generations', type=int, default=100)
+    train_parser.add_argument('--population', type=int, default=TRAIN_POPULATION)
+    train_parser.add_argument('--hidden', type=int, default=TRAIN_HIDDEN_SIZE)
+    train_parser.add_argument('--courses', type=int, default=TRAIN_COURSES)
+    train_parser.add_argument('--max-frames', type=int, default=TRAIN_MAX_FRAMES)
+    train_parser.add_argument('--seed', type=int, default=0)
+    train_parser.add_argument('--workers', type=int, default=None)
+    train_parser.add_argument('--course-file', default=None,
+                              help="courses precomputed by python -m game.course save")
+    train_parser.add_argument('--checkpoint', default='checkpoints/population.npz')
+    train_parser.add_argument('--resume', action='store_true', help="continue from --checkpoint")
+
+    play_parser = commands.add_parser('play', help="watch the best genome of a checkpoint")
+    play_parser.add_argument('checkpoint')
+    play_parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    if args.command == 'train':
+        if args.resume and os.path.exists(args.checkpoint):
+            trainer = Trainer.load(args.checkpoint, workers=args.workers, course_file=args.course_file)
+        else:
+            trainer = Trainer(args.population, args.hidden, args.courses, args.max_frames,
+                              args.seed, args.workers, args.course_file)
+        try:
+            trainer.train(args.generations, args.checkpoint)
+        finally:
+            trainer.close()
+    else:
+        data = np.load(args.checkpoint)
+        genome = data['population'][int(np.argmax(data['fitness']))]
+        play(genome, args.seed, int(data['hidden']))
+
+
+if __name__ == "__main__":
+    main()
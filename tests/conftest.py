@@ -0,0 +1,8 @@
+"""
+Shared test setup: run pygame without a window or sound device
+"""
+
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
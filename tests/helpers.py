@@ -0,0 +1,35 @@
+"""
+Helpers for tests that play seeded rounds headless
+"""
+
+import pygame
+from game.main import Game
+from game.constants import PIPE_WIDTH
+from game.latency import stamp_events
+
+JUMP = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)
+STEER_FRAMES = 500  # The autopilot gives up after this, so rounds also cover losing lives and ending
+
+
+def start_round(seed, difficulty='classic'):
+    """Get a headless game playing a fresh round on a seeded course"""
+    game = Game(headless=True)
+    game.course_seed = seed
+    game.difficulty = difficulty
+    game.current_state.next_state = 'playing'
+    game.handle_state_transition()
+    return game
+
+
+def autopilot(game):
+    """Jump when the bird is below the next gap for a while, then let it fall"""
+    if game.round_frames >= STEER_FRAMES:
+        return []
+    target = game.bird.rect.centery
+    for pipe_pair in game.pipes:
+        if pipe_pair.x + PIPE_WIDTH >= game.bird.rect.x:
+            target = pipe_pair.get_gap_center()
+            break
+    if game.bird.rect.centery > target + 10 and game.bird.velocity >= -1:
+        return stamp_events([JUMP])
+    return []
@@ -0,0 +1,80 @@
+"""
+Tests that the shortcuts through the game rules match Game.step()
+
+Game.advance(k) must leave a round exactly where k calls of step() would, and
+the trainer's vectorized simulation must play a course like the real game.
+"""
+
+import numpy as np
+import pytest
+from game.main import Game
+from game.game_state import MenuState, PlayingState, GameOverState
+from game.latency import stamp_events
+from game.snapshot import snapshot
+from game.course import Course
+from game.trainer import CourseTables, simulate, policy, game_features, genome_size
+from helpers import JUMP, start_round, autopilot
+
+MAX_FRAMES = 600
+
+
+@pytest.mark.parametrize('difficulty', ['classic', 'hard'])
+@pytest.mark.parametrize('frames', range(1, 17))
+def test_advance_matches_steps(frames, difficulty):
+    stepped = start_round(7, difficulty)
+    advanced = start_round(7, difficulty)
+    played = 0
+    while played < 3 * MAX_FRAMES:
+        events = autopilot(stepped)
+        count = 0
+        for _ in range(frames):
+            stepped.step(events)
+            events = []
+            count += 1
+            if stepped.current_state.get_next_state():
+                break
+        assert advanced.advance(frames, autopilot(advanced)) == count
+        played += count
+        if stepped.current_state.get_next_state():
+            break
+        assert snapshot(advanced) == snapshot(stepped), f"diverged after {played} frames"
+    # Both end the round on the same frame
+    assert stepped.current_state.get_next_state() == 'game_over'
+    assert advanced.current_state.get_next_state() == stepped.current_state.get_next_state()
+    assert advanced.bird.lives == stepped.bird.lives
+
+
+def test_advance_after_game_over_does_nothing():
+    game = start_round(3)
+    while game.advance(16):
+        pass
+    assert isinstance(game.current_state, GameOverState)
+    assert game.advance(16) == 0
+
+
+def play_genome(game, genome, seed, max_frames):
+    """Play a round in the game with a policy network, returns (score, frames)"""
+    game.course_seed = seed
+    game.current_state = MenuState()
+    game.current_state.next_state = 'playing'
+    game.handle_state_transition()
+    frames = 0
+    while isinstance(game.current_state, PlayingState) and frames < max_frames:
+        game.step(stamp_events([JUMP]) if policy(genome, game_features(game)) else [])
+        frames += 1
+    if isinstance(game.current_state, GameOverState):
+        return game.current_state.final_score, frames
+    return game.current_state.score, frames
+
+
+def test_trainer_matches_game():
+    seed = 4
+    genomes = np.random.default_rng(0).normal(size=(64, genome_size()))
+    score, frames = simulate(genomes, [CourseTables(Course(seed), MAX_FRAMES)])
+    # The longest-lived genomes exercise pipes, coins and lost lives
+    game = Game(headless=True)
+    for i in np.argsort(-frames[0])[:8]:
+        game_score, game_frames = play_genome(game, genomes[i], seed, MAX_FRAMES)
+        assert game_score == score[0, i]
+        # The game notices death at the end of the frame the last life was lost on
+        assert game_frames in (frames[0, i], frames[0, i] + 1)
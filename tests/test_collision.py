@@ -0,0 +1,103 @@
+"""
+Tests for swept collision against pygame's own overlap test
+"""
+
+import itertools
+import random
+import pygame
+from game.collision import sweep, sweep_from
+
+
+def test_touching_edges_do_not_collide():
+    rect = pygame.Rect(0, 0, 10, 10)
+    for other in (pygame.Rect(10, 0, 10, 10), pygame.Rect(-10, 0, 10, 10),
+                  pygame.Rect(0, 10, 10, 10), pygame.Rect(0, -10, 10, 10), pygame.Rect(10, 10, 10, 10)):
+        assert not rect.colliderect(other)
+        assert sweep(rect, (0, 0), other) is None
+
+
+def test_overlap_at_start_is_time_zero():
+    assert sweep(pygame.Rect(0, 0, 10, 10), (5, 0), pygame.Rect(9, 9, 10, 10)) == 0
+
+
+def test_move_ending_on_an_edge_does_not_collide():
+    rect = pygame.Rect(0, 0, 10, 10)
+    other = pygame.Rect(20, 0, 10, 10)
+    assert not rect.move(10, 0).colliderect(other)
+    assert sweep(rect, (10, 0), other) is None
+    assert sweep(rect, (11, 0), other) == 10 / 11
+
+
+def test_sliding_along_an_edge_does_not_collide():
+    rect = pygame.Rect(0, 10, 10, 10)
+    other = pygame.Rect(20, 0, 10, 10)
+    assert sweep(rect, (100, 0), other) is None
+    assert sweep(rect, (100, -1), other) is not None
+
+
+def test_static_rects_match_colliderect():
+    for x, y, w, h in itertools.product(range(-4, 5), range(-4, 5), (1, 3), (1, 3)):
+        rect = pygame.Rect(x, y, w, h)
+        other = pygame.Rect(0, 0, 2, 2)
+        assert (sweep(rect, (0, 0), other) is not None) == rect.colliderect(other)
+
+
+def overlaps_at(rect, delta, other, time):
+    """Check if rect moved by delta * time overlaps other, like colliderect but for float positions"""
+    x = rect.x + delta[0] * time
+    y = rect.y + delta[1] * time
+    return x < other.right and other.x < x + rect.width and y < other.bottom and other.y < y + rect.height
+
+
+def test_random_moves_match_sampled_overlap():
+    rng = random.Random(0)
+    for _ in range(2000):
+        rect = pygame.Rect(rng.randint(-20, 20), rng.randint(-20, 20), rng.randint(1, 10), rng.randint(1, 10))
+        other = pygame.Rect(rng.randint(-20, 20), rng.randint(-20, 20), rng.randint(1, 10), rng.randint(1, 10))
+        delta = (rng.randint(-20, 20), rng.randint(-20, 20))
+        time = sweep(rect, delta, other)
+        samples = [i / 256 for i in range(257)]
+        if rect.colliderect(other):
+            assert time == 0
+        if rect.move(delta).colliderect(other):
+            assert time is not None
+        if time is None:
+            assert not any(overlaps_at(rect, delta, other, t) for t in samples)
+        else:
+            # Not overlapping before the time of impact, overlapping right after it
+            assert not any(overlaps_at(rect, delta, other, t) for t in samples if t < time)
+            assert overlaps_at(rect, delta, other, time + 1e-6)
+
+
+def test_fast_rect_does_not_tunnel():
+    bird = pygame.Rect(0, 300, 30, 30)
+    pipe = pygame.Rect(200, 0, 80, 600)
+    end = bird.move(500, 0)
+    assert not bird.colliderect(pipe) and not end.colliderect(pipe)
+    assert sweep_from(bird, end, pipe) == (200 - 30) / 500
+
+
+def test_fast_fall_through_thin_rect():
+    bird = pygame.Rect(100, 0, 30, 30)
+    ledge = pygame.Rect(0, 300, 400, 2)
+    end = bird.move(0, 600)
+    assert not end.colliderect(ledge)
+    assert sweep_from(bird, end, ledge) == (300 - 30) / 600
+
+
+def test_fast_miss_through_gap():
+    bird = pygame.Rect(0, 285, 30, 30)
+    top = pygame.Rect(200, 0, 80, 250)
+    bottom = pygame.Rect(200, 350, 80, 250)
+    assert sweep(bird, (1000, 0), top) is None
+    assert sweep(bird, (1000, 0), bottom) is None
+
+
+def test_both_rects_moving():
+    bird = pygame.Rect(0, 0, 10, 10)
+    coin = pygame.Rect(100, 0, 10, 10)
+    # Closing at 20 pixels per frame from 90 pixels apart
+    assert sweep(bird, (10, 0), coin, (-10, 0)) is None
+    assert sweep(bird, (50, 0), coin, (-50, 0)) == 90 / 100
+    # Moving together never closes the distance
+    assert sweep(bird, (1000, 0), coin, (1000, 0)) is None
@@ -0,0 +1,62 @@
+"""
+Tests that courses are the same however they are generated, read or stored
+
+Shared tournament courses depend on a seed and curve always giving the same
+pipes, whether generated in one go, read ahead piecemeal or loaded from a file.
+"""
+
+import pytest
+from game.course import Course, DifficultyCurve, DIFFICULTY_CURVES, save_courses, load_courses
+
+CURVES = sorted(DIFFICULTY_CURVES)
+
+
+def pipes(course, count):
+    """Get the first count pipe pairs of a course as (position, gap y, gap size, has coin)"""
+    return [course.get(i) for i in range(count)]
+
+
+@pytest.mark.parametrize('curve', CURVES)
+def test_same_course_however_far_ahead_it_was_read(curve):
+    expected = Course(3, curve)
+    expected.generate(500)
+
+    one_at_a_time = Course(3, curve)
+    assert pipes(one_at_a_time, 500) == pipes(expected, 500)
+
+    by_position = Course(3, curve)
+    for position in range(0, expected.positions[499], 997):
+        count = by_position.generate_to(position)
+        assert by_position.positions[:count] == [p for p in expected.positions if p <= position]
+    assert by_position.upcoming(450, 50) == expected.upcoming(450, 50)
+
+
+def test_seeds_and_curves_give_different_courses():
+    base = pipes(Course(3, 'classic'), 100)
+    assert pipes(Course(4, 'classic'), 100) != base
+    assert pipes(Course(3, 'hard'), 100) != base
+
+
+@pytest.mark.parametrize('curve', CURVES)
+def test_saved_courses_load_identical(tmp_path, curve):
+    path = tmp_path / 'courses.npz'
+    save_courses(path, [0, 7, 123456789], 40, curve, chunk_size=16)
+    courses = load_courses(path)
+
+    assert sorted(courses) == [0, 7, 123456789]
+    for seed, loaded in courses.items():
+        assert len(loaded) == 48  # Rounded up to whole chunks
+        assert loaded.curve is DIFFICULTY_CURVES[curve]
+        generated = Course(seed, curve, chunk_size=16)
+        assert pipes(loaded, 48) == pipes(generated, 48)
+        # Carrying on past the end of the file gives the pipes it would have had
+        assert pipes(loaded, 300) == pipes(generated, 300)
+        assert all(type(value) in (int, bool) for value in loaded.get(10))
+
+
+def test_save_courses_needs_a_registered_curve(tmp_path):
+    with pytest.raises(ValueError):
+        save_courses(tmp_path / 'custom.npz', [0], 16, DifficultyCurve(gap_start=150))
+    with pytest.raises(ValueError):
+        save_courses(tmp_path / 'unknown.npz', [0], 16, 'nightmare')
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,67 @@
+"""
+Tests that server deltas round-trip into the state a client rebuilds from them
+"""
+
+import random
+from game.constants import PIPE_SPEED, PIPE_WIDTH
+from game.server import (
+    Session, FIELDS, FIELD_MODE, FIELD_PRESSES, MODE_PLAYING, LENGTH, apply_delta
+)
+
+
+class ModelClient:
+    """Keeps the field values and pipes a client learns from deltas"""
+
+    def __init__(self):
+        self.fields = [None] * len(FIELDS)
+        self.pipes = []  # [x, gap y, gap size, has coin]
+        self.tick = 0
+
+    def receive(self, message):
+        length, = LENGTH.unpack_from(message)
+        assert length == len(message) - LENGTH.size
+        was_playing = self.fields[FIELD_MODE] == MODE_PLAYING
+        tick, spawns = apply_delta(self.fields, message[LENGTH.size:])
+
+        # Pipes move on their own, a new round starts without any
+        for pipe in self.pipes:
+            pipe[0] -= PIPE_SPEED * (tick - self.tick)
+        self.pipes = [pipe for pipe in self.pipes if pipe[0] + PIPE_WIDTH >= 0]
+        if not was_playing:
+            self.pipes = []
+        self.pipes.extend(list(spawn) for spawn in spawns)
+        self.tick = tick
+        return spawns
+
+
+def test_deltas_round_trip():
+    session = Session(1, seed=5)
+    client = ModelClient()
+    rng = random.Random(0)
+    tick = 0
+    spawn_records = 0
+    for _ in range(3000):
+        if session.bird.rect.y > 320 and session.bird.velocity >= 0 or rng.random() < 0.01:
+            session.press()
+        frames = rng.choice((1, 1, 1, 2, 3))  # Late clocks run catch-up frames
+        session.tick(frames)
+        tick += frames
+
+        expected = [(pipe_pair.x, pipe_pair.gap_y, pipe_pair.gap, has_coin)
+                    for pipe_pair, has_coin in session.spawned]
+        message = session.encode_delta(tick)
+        if message is None:
+            assert not expected
+            continue
+        spawns = client.receive(message)
+        spawn_records += len(spawns)
+
+        assert spawns == expected
+        assert client.tick == tick
+        assert tuple(client.fields) == session.get_fields()
+        # The tick a round ends on stops moving pipes at the death, the next delta ends the round
+        if client.fields[FIELD_MODE] == MODE_PLAYING and not session.current_state.get_next_state():
+            assert [pipe[:3] for pipe in client.pipes] == [
+                [pipe_pair.x, pipe_pair.gap_y, pipe_pair.gap] for pipe_pair in session.pipes]
+    assert spawn_records > 10
+    assert client.fields[FIELD_PRESSES] > 0
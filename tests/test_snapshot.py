@@ -0,0 +1,53 @@
+"""
+Tests for snapshots and rewinding
+"""
+
+from game.game_state import PlayingState
+from game.latency import stamp_events
+from game.snapshot import SnapshotRing, snapshot, restore
+from helpers import start_round, autopilot
+
+
+def play_until_death(game, ring):
+    """Play a round until the last life is lost, returns the events and snapshot of every frame"""
+    inputs = []
+    records = []
+    while not game.current_state.get_next_state():
+        events = autopilot(game)
+        game.step(events)
+        ring.push(game)
+        inputs.append([event for event, _ in events])
+        records.append(snapshot(game))
+    assert game.current_state.get_next_state() == 'game_over'
+    return inputs, records
+
+
+def test_rewind_from_death_replays_the_same():
+    game = start_round(11)
+    ring = SnapshotRing()
+    inputs, records = play_until_death(game, ring)
+
+    ring.rewind(game, 150)
+    start = len(records) - 150
+    assert snapshot(game) == records[start - 1]
+    for frame in range(start, len(records) - 1):
+        game.step(stamp_events(inputs[frame]))
+        assert isinstance(game.current_state, PlayingState)
+        assert snapshot(game) == records[frame], f"diverged on frame {frame}"
+    game.step(stamp_events(inputs[-1]))
+    assert game.current_state.get_next_state() == 'game_over'
+
+
+def test_restore_into_another_game():
+    game = start_round(11)
+    for _ in range(300):
+        game.step(autopilot(game))
+    record = snapshot(game)
+
+    other = start_round(12)
+    restore(other, record)
+    assert snapshot(other) == record
+    for _ in range(200):
+        game.step(autopilot(game))
+        other.step(autopilot(other))
+        assert snapshot(other) == snapshot(game)